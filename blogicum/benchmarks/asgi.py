@@ -0,0 +1,82 @@
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.urls import reverse
+
+from benchmarks.concurrency import ConcurrentWriteBenchmark
+from benchmarks.runner import PERCENTILES, percentile
+from benchmarks.worker import browse_in_worker, init_asgi_worker
+from blog.utils import get_posts
+
+# Значение настройки ASYNC_VIEWS для каждого режима.
+ASGI_MODES = {'sync': False, 'async': True}
+
+
+class AsgiBenchmark:
+    """Конкурентные клиенты открывают страницы через ASGI-обработчик.
+
+    Каждый режим работает в отдельном процессе со своим набором
+    представлений; клиенты вошли в систему, чтобы страницы не брались
+    из кеша лент. Считаются пропускная способность и хвост задержек.
+    """
+
+    def __init__(self, clients=20, requests=20):
+        self.clients = clients
+        self.requests = requests
+
+    def pages(self):
+        post = get_posts().first()
+        if post is None:
+            raise RuntimeError(
+                'Нет опубликованных постов: сначала запустите generate_data.'
+            )
+        return [
+            reverse('blog:index'),
+            reverse('blog:category_posts', args=[post.category.slug]),
+            reverse('blog:profile', args=[post.author.username]),
+            reverse('blog:post_detail', args=[post.pk]),
+        ]
+
+    def sessions(self):
+        users = list(get_user_model().objects.all()[:self.clients])
+        if not users:
+            raise RuntimeError('Нет пользователей для входа клиентов.')
+        keys = [ConcurrentWriteBenchmark.login(user) for user in users]
+        return [keys[i % len(keys)] for i in range(self.clients)]
+
+    def run_mode(self, async_views, sessions, urls):
+        # Дочерний процесс открывает базу сам; своё соединение не держим.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            1,
+            mp_context=get_context('spawn'),
+            initializer=init_asgi_worker,
+            initargs=(async_views,),
+        ) as pool:
+            return self.summarize(pool.submit(
+                browse_in_worker, sessions, urls, self.requests
+            ).result())
+
+    @staticmethod
+    def summarize(result):
+        latencies = result['latencies']
+        summary = {
+            'requests': len(latencies),
+            'errors': result['errors'],
+            'per_s': round(len(latencies) / result['elapsed_s'], 1),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'max_ms': round(max(latencies), 2),
+        }
+        for p in PERCENTILES:
+            summary[f'p{p}_ms'] = round(percentile(latencies, p), 2)
+        return summary
+
+    def run(self, modes=ASGI_MODES):
+        urls, sessions = self.pages(), self.sessions()
+        return {
+            name: self.run_mode(async_views, sessions, urls)
+            for name, async_views in modes.items()
+        }
@@ -0,0 +1,103 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client
+
+from benchmarks.worker import (
+    init_worker,
+    read_post_in_worker,
+    write_comments_in_worker,
+)
+from blog.utils import get_posts
+
+# Режим журнала хранится в файле базы и переключается только монопольно,
+# поэтому его выставляет родительский процесс до запуска дочерних.
+SQLITE_PROFILES = {
+    # Настройки SQLite по умолчанию: журнал отката и отложенные транзакции.
+    'stock': {'journal_mode': 'DELETE', 'options': {}},
+    'configured': {
+        'journal_mode': settings.SQLITE_PRAGMAS['journal_mode'],
+        'options': settings.DATABASES['default'].get('OPTIONS', {}),
+    },
+}
+
+
+class ConcurrentWriteBenchmark:
+    """Процессы-писатели добавляют комментарии, пока читатели открывают пост.
+
+    Для каждого профиля SQLite считает успешные запросы, ошибки
+    «database is locked» и пропускную способность.
+    """
+
+    def __init__(self, writers=4, writes=50, readers=2, reads=100):
+        self.writers = writers
+        self.writes = writes
+        self.readers = readers
+        self.reads = reads
+
+    def run_profile(self, journal_mode, options):
+        post = get_posts().first()
+        if post is None:
+            raise RuntimeError(
+                'Нет опубликованных постов: сначала запустите generate_data.'
+            )
+        # Сессии создаются заранее, чтобы вход не участвовал в замере.
+        sessions = [
+            self.login(user)
+            for user in get_user_model().objects.all()[:self.writers]
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+        # Дочерние процессы открывают базу сами; своё соединение не держим.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            self.writers + self.readers,
+            mp_context=get_context('spawn'),
+            initializer=init_worker,
+            initargs=(options,),
+        ) as pool:
+            writes = [
+                pool.submit(
+                    write_comments_in_worker,
+                    sessions[i % len(sessions)],
+                    post.pk,
+                    self.writes,
+                )
+                for i in range(self.writers)
+            ]
+            reads = [
+                pool.submit(read_post_in_worker, post.pk, self.reads)
+                for _ in range(self.readers)
+            ]
+            writes = [future.result() for future in writes]
+            reads = [future.result() for future in reads]
+        return {
+            'writes': self.summarize(writes),
+            'reads': self.summarize(reads),
+        }
+
+    @staticmethod
+    def login(user):
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    @staticmethod
+    def summarize(results):
+        elapsed = max(result['elapsed_s'] for result in results)
+        summary = {
+            key: sum(result[key] for result in results)
+            for key in ('ok', 'locked', 'errors')
+        }
+        summary['elapsed_s'] = round(elapsed, 2)
+        summary['per_s'] = round(summary['ok'] / elapsed, 1)
+        return summary
+
+    def run(self, profiles=SQLITE_PROFILES):
+        return {
+            name: self.run_profile(**profile)
+            for name, profile in profiles.items()
+        }
@@ -0,0 +1,168 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from blog.caching import invalidate_feeds
+from blog.models import Category, Comment, Location, Post, make_excerpt
+from blog.utils import (
+    recount_comments,
+    refresh_visibility,
+    sync_feed_entries,
+)
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+TEXT_POOL_SIZE = 500
+FUTURE_SHARE = 0.05
+UNPUBLISHED_SHARE = 0.05
+
+
+class DataGenerator:
+    """Массово создаёт синтетических авторов, посты и комментарии.
+
+    Тексты берутся из заранее сгенерированного пула, чтобы Faker
+    не был узким местом на миллионах строк.
+    """
+
+    def __init__(self, seed=None, batch_size=1000, log=None):
+        self.random = random.Random(seed)
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(seed)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.sentences = [
+            self.faker.sentence() for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.paragraphs = [
+            self.faker.paragraph(nb_sentences=8)
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.now = timezone.now()
+
+    def _bulk_create(self, model, objects, total):
+        """Сохранить объекты пачками и вернуть список их pk."""
+        pks = []
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                pks.extend(o.pk for o in model.objects.bulk_create(batch))
+                batch = []
+                self.log(
+                    f'{model._meta.verbose_name_plural}: {len(pks)}/{total}'
+                )
+        if batch:
+            pks.extend(o.pk for o in model.objects.bulk_create(batch))
+        return pks
+
+    def users(self, count):
+        password = make_password(BENCHMARK_PASSWORD)
+        prefix = self.faker.unique.lexify('bench????')
+        return self._bulk_create(
+            get_user_model(),
+            (
+                get_user_model()(
+                    username=f'{prefix}{i}',
+                    first_name=self.faker.first_name(),
+                    last_name=self.faker.last_name(),
+                    password=password,
+                )
+                for i in range(count)
+            ),
+            count,
+        )
+
+    def categories(self, count):
+        prefix = self.faker.unique.lexify('bench????')
+        return self._bulk_create(
+            Category,
+            (
+                Category(
+                    title=f'{self.random.choice(self.sentences)[:200]} {i}',
+                    description=self.random.choice(self.paragraphs),
+                    slug=f'{prefix}-{i}',
+                )
+                for i in range(count)
+            ),
+            count,
+        )
+
+    def locations(self, count):
+        return self._bulk_create(
+            Location,
+            (Location(name=self.faker.city()) for _ in range(count)),
+            count,
+        )
+
+    def _pub_date(self):
+        if self.random.random() < FUTURE_SHARE:
+            return self.now + timedelta(
+                minutes=self.random.randint(1, 60 * 24 * 30)
+            )
+        return self.now - timedelta(
+            minutes=self.random.randint(1, 60 * 24 * 730)
+        )
+
+    def posts(self, count, users, categories, locations):
+        return self._bulk_create(
+            Post,
+            (
+                Post(
+                    title=self.random.choice(self.sentences)[:256],
+                    text=text,
+                    excerpt=make_excerpt(text),
+                    pub_date=self._pub_date(),
+                    is_published=self.random.random() >= UNPUBLISHED_SHARE,
+                    author_id=self.random.choice(users),
+                    category_id=self.random.choice(categories),
+                    location_id=(
+                        self.random.choice(locations)
+                        if locations and self.random.random() < 0.7 else None
+                    ),
+                )
+                for text in (
+                    self.random.choice(self.paragraphs) for _ in range(count)
+                )
+            ),
+            count,
+        )
+
+    def comments(self, count, users, posts):
+        # Комментарии распределены неравномерно, как в живом блоге.
+        hot_posts = posts[:max(1, len(posts) // 100)]
+        self._bulk_create(
+            Comment,
+            (
+                Comment(
+                    text=self.random.choice(self.sentences),
+                    author_id=self.random.choice(users),
+                    post_id=self.random.choice(
+                        hot_posts if self.random.random() < 0.3 else posts
+                    ),
+                )
+                for _ in range(count)
+            ),
+            count,
+        )
+
+    def generate(self, users, categories, locations, posts, comments):
+        with transaction.atomic():
+            user_ids = self.users(users)
+            category_ids = self.categories(categories)
+            location_ids = self.locations(locations)
+            post_ids = self.posts(
+                posts, user_ids, category_ids, location_ids
+            )
+            if post_ids:
+                self.comments(comments, user_ids, post_ids)
+                created = Post.objects.filter(
+                    pk__range=(min(post_ids), max(post_ids))
+                )
+                recount_comments(created)
+                refresh_visibility(created)
+                sync_feed_entries(created)
+        invalidate_feeds()
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.data import DataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими пользователями, постами и т. д.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=500_000)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Зерно генератора для воспроизводимых данных.',
+        )
+
+    def handle(self, *args, **options):
+        generator = DataGenerator(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        generator.generate(
+            users=options['users'],
+            categories=options['categories'],
+            locations=options['locations'],
+            posts=options['posts'],
+            comments=options['comments'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Создано: пользователей {users}, категорий {categories}, '
+            'местоположений {locations}, постов {posts}, '
+            'комментариев {comments}.'.format(**options)
+        ))
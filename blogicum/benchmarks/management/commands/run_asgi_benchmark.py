@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.asgi import ASGI_MODES, AsgiBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает синхронные и асинхронные представления страниц '
+        'под ASGI при конкурентных клиентах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=20)
+        parser.add_argument(
+            '--requests', type=int, default=20,
+            help='Запросов на клиента.',
+        )
+        parser.add_argument(
+            '--mode', nargs='*', choices=ASGI_MODES,
+            help='Запустить только перечисленные режимы.',
+        )
+
+    def handle(self, *args, **options):
+        modes = {
+            name: value for name, value in ASGI_MODES.items()
+            if not options['mode'] or name in options['mode']
+        }
+        results = AsgiBenchmark(
+            clients=options['clients'], requests=options['requests']
+        ).run(modes)
+        for name, summary in results.items():
+            self.stdout.write(
+                f'{name:<6} {summary["per_s"]:>8} в секунду  '
+                f'p50 {summary["p50_ms"]:>8} мс  '
+                f'p99 {summary["p99_ms"]:>8} мс  '
+                f'max {summary["max_ms"]:>8} мс  '
+                f'ошибок {summary["errors"]}'
+            )
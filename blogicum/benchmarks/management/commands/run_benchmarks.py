@@ -0,0 +1,62 @@
+import json
+import subprocess
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from benchmarks.runner import BenchmarkRunner
+from blog.models import Comment, Post
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Замеряет задержки и число SQL-запросов основных страниц.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--only', nargs='*',
+            help='Запустить только перечисленные сценарии.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Куда записать JSON; по умолчанию bench-<коммит>.json.',
+        )
+
+    def handle(self, *args, **options):
+        commit = current_commit()
+        results = BenchmarkRunner(
+            iterations=options['iterations'], warmup=options['warmup']
+        ).run(options['only'])
+        report = {
+            'commit': commit,
+            'created_at': timezone.now().isoformat(),
+            'dataset': {
+                'posts': Post.objects.count(),
+                'comments': Comment.objects.count(),
+            },
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        output = Path(options['output'] or f'bench-{commit or "local"}.json')
+        output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8'
+        )
+        for name, summary in results.items():
+            self.stdout.write(
+                f'{name:<18} p50 {summary["p50_ms"]:>8} мс  '
+                f'p99 {summary["p99_ms"]:>8} мс  '
+                f'SQL {summary["queries"]}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Результаты: {output}'))
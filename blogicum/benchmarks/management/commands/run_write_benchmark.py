@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.concurrency import SQLITE_PROFILES, ConcurrentWriteBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает профили SQLite под конкурентной записью комментариев '
+        'из нескольких процессов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument(
+            '--writes', type=int, default=50,
+            help='Комментариев на процесс-писатель.',
+        )
+        parser.add_argument('--readers', type=int, default=2)
+        parser.add_argument(
+            '--reads', type=int, default=100,
+            help='Открытий страницы публикации на процесс-читатель.',
+        )
+        parser.add_argument(
+            '--profile', nargs='*', choices=SQLITE_PROFILES,
+            help='Запустить только перечисленные профили.',
+        )
+
+    def handle(self, *args, **options):
+        profiles = {
+            name: value for name, value in SQLITE_PROFILES.items()
+            if not options['profile'] or name in options['profile']
+        }
+        results = ConcurrentWriteBenchmark(
+            writers=options['writers'],
+            writes=options['writes'],
+            readers=options['readers'],
+            reads=options['reads'],
+        ).run(profiles)
+        for name, summary in results.items():
+            for kind, label in (('writes', 'запись'), ('reads', 'чтение')):
+                row = summary[kind]
+                self.stdout.write(
+                    f'{name:<12} {label:<7} успешно {row["ok"]:>6}  '
+                    f'locked {row["locked"]:>5}  '
+                    f'прочих ошибок {row["errors"]:>4}  '
+                    f'{row["per_s"]:>8} в секунду'
+                )
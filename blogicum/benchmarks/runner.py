@@ -0,0 +1,108 @@
+import math
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.constants import POSTS_ON_PAGE
+from blog.utils import get_posts
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(values, p):
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(latencies, queries):
+    summary = {
+        'requests': len(latencies),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'max_ms': round(max(latencies), 2),
+        'queries': statistics.median(queries),
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = round(percentile(latencies, p), 2)
+    return summary
+
+
+class BenchmarkRunner:
+    """Гоняет типовые запросы через тестовый клиент Django.
+
+    Для каждого сценария считает перцентили задержки и число SQL-запросов.
+    """
+
+    def __init__(self, iterations=50, warmup=5, host='localhost'):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.host = host
+
+    def client(self, user=None):
+        client = Client(SERVER_NAME=self.host)
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def measure(self, send):
+        for _ in range(self.warmup):
+            send()
+        latencies, queries = [], []
+        for _ in range(self.iterations):
+            with CaptureQueriesContext(connections['default']) as captured:
+                start = time.perf_counter()
+                response = send()
+                latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f'Ответ {response.status_code} на '
+                    f'{response.request["PATH_INFO"]}'
+                )
+            queries.append(len(captured))
+        return summarize(latencies, queries)
+
+    def scenarios(self):
+        post = (
+            get_posts().order_by('-comment_count').first()
+            if get_posts().exists() else None
+        )
+        if post is None:
+            raise RuntimeError(
+                'Нет опубликованных постов: сначала запустите generate_data.'
+            )
+        author = post.author
+        reader = self.client(
+            get_user_model().objects.exclude(pk=author.pk).first() or author
+        )
+        anonymous = self.client()
+        deep_page = max(1, get_posts().count() // POSTS_ON_PAGE // 2)
+        urls = {
+            'index': reverse('blog:index'),
+            'category_posts': reverse(
+                'blog:category_posts', args=[post.category.slug]
+            ),
+            'profile': reverse('blog:profile', args=[author.username]),
+            'post_detail': reverse('blog:post_detail', args=[post.pk]),
+        }
+        yield 'index_anonymous', lambda: anonymous.get(urls['index'])
+        for name, url in urls.items():
+            yield name, lambda url=url: reader.get(url)
+        yield 'index_deep_page', lambda: reader.get(
+            urls['index'], {'page': deep_page}
+        )
+        yield 'add_comment', lambda: reader.post(
+            reverse('blog:add_comment', args=[post.pk]),
+            {'text': 'Комментарий из нагрузочного замера'},
+        )
+
+    def run(self, only=None):
+        return {
+            name: self.measure(send)
+            for name, send in self.scenarios()
+            if not only or name in only
+        }
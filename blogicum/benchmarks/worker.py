@@ -0,0 +1,110 @@
+"""Точки входа для процессов run_write_benchmark и run_asgi_benchmark.
+
+Модуль импортируется в дочернем процессе до django.setup(), поэтому
+Django и модели здесь подключаются только внутри функций.
+"""
+import time
+
+import django
+
+
+def init_worker(database_options):
+    from django.conf import settings
+
+    # Подменяем OPTIONS до первого соединения: профиль SQLite
+    # применяется при его открытии.
+    settings.DATABASES['default']['OPTIONS'] = database_options
+    django.setup()
+
+
+def _send_all(send, count):
+    from django.db import OperationalError, connections
+
+    result = {'ok': 0, 'locked': 0, 'errors': 0}
+    start = time.perf_counter()
+    try:
+        for _ in range(count):
+            try:
+                response = send()
+            except OperationalError as error:
+                result['locked' if 'locked' in str(error) else 'errors'] += 1
+            else:
+                result['ok' if response.status_code < 400 else 'errors'] += 1
+    finally:
+        connections.close_all()
+    result['elapsed_s'] = time.perf_counter() - start
+    return result
+
+
+def write_comments_in_worker(session_key, post_id, writes):
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client(SERVER_NAME='localhost')
+    client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+    url = reverse('blog:add_comment', args=[post_id])
+    return _send_all(
+        lambda: client.post(
+            url, {'text': 'Комментарий из замера конкурентной записи'}
+        ),
+        writes,
+    )
+
+
+def read_post_in_worker(post_id, reads):
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client(SERVER_NAME='localhost')
+    url = reverse('blog:post_detail', args=[post_id])
+    return _send_all(lambda: client.get(url), reads)
+
+
+def init_asgi_worker(async_views):
+    from django.conf import settings
+
+    # Представления выбираются при импорте blog.urls, то есть после setup.
+    settings.ASYNC_VIEWS = async_views
+    # AsyncClient всегда шлёт Host: testserver, как и тестовое окружение.
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    django.setup()
+
+
+async def _browse(session_key, urls, requests):
+    from asgiref.sync import ThreadSensitiveContext, sync_to_async
+    from django.conf import settings
+    from django.db import connections
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    if session_key is not None:
+        client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+    latencies, errors = [], 0
+    for number in range(requests):
+        # Как ASGIHandler: у каждого запроса свой поток для синхронного кода.
+        async with ThreadSensitiveContext():
+            start = time.perf_counter()
+            response = await client.get(urls[number % len(urls)])
+            latencies.append((time.perf_counter() - start) * 1000)
+            await sync_to_async(connections.close_all)()
+        errors += response.status_code >= 400
+    return latencies, errors
+
+
+def browse_in_worker(sessions, urls, requests):
+    import asyncio
+
+    async def browse_all():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(_browse(key, urls, requests) for key in sessions)
+        )
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(browse_all())
+    return {
+        'latencies': [ms for latencies, _ in results for ms in latencies],
+        'errors': sum(errors for _, errors in results),
+        'elapsed_s': elapsed,
+    }
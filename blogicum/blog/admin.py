@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from blog.models import Category, Comment, Location, Post
+from blog.models import Category, Comment, Job, Location, Post
+from blog.search import search_posts
 
 
 @admin.register(Post)
@@ -14,6 +15,7 @@ class PostAdmin(admin.ModelAdmin):
         'text',
         'pub_date',
         'created_at',
+        'comment_count',
     )
     list_editable = (
         'is_published',
@@ -23,6 +25,11 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category', 'is_published',)
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -62,8 +69,25 @@ class CommentAdmin(admin.ModelAdmin):
         'text',
         'post',
         'created_at',
-        'author'
+        'author',
+        'is_published',
+    )
+    list_editable = (
+        'is_published',
+    )
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'kind',
+        'status',
+        'attempts',
+        'created_at',
+        'updated_at',
     )
+    list_filter = ('kind', 'status',)
+    readonly_fields = ('attempts', 'error', 'created_at', 'updated_at')
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -0,0 +1,99 @@
+"""Асинхронные варианты страниц блога только для чтения.
+
+Подключаются вместо представлений из blog.views при ASYNC_VIEWS = True
+и под ASGI не занимают поток на время запросов к базе.
+"""
+from django.contrib.auth import get_user_model
+from django.shortcuts import aget_object_or_404, render
+
+from blog.caching import cache_anonymous_feed, conditional_page
+from blog.constants import COMMENTS_ON_PAGE, COMMENTS_ORDERING
+from blog.forms import CommentForm
+from blog.models import Category
+from blog.utils import (
+    acursor_pagination,
+    aposts_pagination,
+    get_posts,
+    visible_posts,
+)
+from blogicum.routers import read_from_replica
+
+
+@read_from_replica
+@conditional_page
+@cache_anonymous_feed('index')
+async def index(request):
+    return render(
+        request,
+        'blog/index.html',
+        {
+            'page_obj': await aposts_pagination(
+                request, get_posts(), count_key='index'
+            ),
+        },
+    )
+
+
+@read_from_replica
+@conditional_page
+async def category_posts(request, category_slug):
+    category = await aget_object_or_404(
+        Category,
+        is_published=True,
+        slug=category_slug,
+    )
+    return render(
+        request,
+        'blog/category.html',
+        {
+            'category': category,
+            'page_obj': await aposts_pagination(
+                request,
+                get_posts(category=category),
+                count_key=f'category:{category.pk}',
+            ),
+        },
+    )
+
+
+@read_from_replica
+@conditional_page
+async def post_detail(request, post_id):
+    post = await aget_object_or_404(
+        visible_posts(await request.auser()), pk=post_id
+    )
+    return render(
+        request,
+        'blog/detail.html',
+        {
+            'post': post,
+            'form': CommentForm(),
+            'comments': await acursor_pagination(
+                post.comments.select_related('author'),
+                per_page=COMMENTS_ON_PAGE,
+                ordering=COMMENTS_ORDERING,
+            ),
+        },
+    )
+
+
+@read_from_replica
+@conditional_page
+async def profile(request, username):
+    author = await aget_object_or_404(
+        get_user_model(),
+        username=username,
+    )
+    is_public = await request.auser() != author
+    return render(
+        request,
+        'blog/profile.html',
+        {
+            'profile': author,
+            'page_obj': await aposts_pagination(
+                request,
+                get_posts(author=author, apply_filters=is_public),
+                count_key=f'profile:{author.pk}:{is_public}',
+            ),
+        },
+    )
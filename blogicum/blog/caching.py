@@ -0,0 +1,208 @@
+from functools import wraps
+from math import ceil
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from blog.constants import FEED_CACHE_TIMEOUT, PAGE_MAX_AGE
+from blog.models import Post
+
+FEED_VERSION_KEY = 'blog:feed:version'
+FEED_CHANGED_AT_KEY = 'blog:feed:changed_at'
+NO_SCHEDULED_POSTS = 'none'
+
+
+def get_feed_version():
+    return cache.get_or_set(FEED_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_feeds():
+    """Сделать устаревшими все закешированные страницы лент."""
+    try:
+        cache.incr(FEED_VERSION_KEY)
+    except ValueError:
+        cache.set(FEED_VERSION_KEY, 1, timeout=None)
+    cache.set(FEED_CHANGED_AT_KEY, timezone.now(), timeout=None)
+
+
+def feed_cache_key(name, page):
+    return f'blog:feed:{name}:{get_feed_version()}:{page}'
+
+
+def next_visibility_change():
+    """Ближайшая дата публикации отложенного поста или None."""
+    key = f'blog:feed:next_change:{get_feed_version()}'
+    pub_date = cache.get(key)
+    if pub_date == NO_SCHEDULED_POSTS:
+        return None
+    if pub_date is not None and pub_date > timezone.now():
+        return pub_date
+    pub_date = (
+        Post.objects.filter(is_visible=True, pub_date__gte=timezone.now())
+        .order_by('pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+    if pub_date is None:
+        cache.set(key, NO_SCHEDULED_POSTS, FEED_CACHE_TIMEOUT)
+    else:
+        cache.set(key, pub_date, feed_cache_timeout(pub_date))
+    return pub_date
+
+
+def feed_last_modified():
+    """Когда в последний раз могло измениться содержимое страниц блога.
+
+    Это время последнего изменения данных или дата последней ставшей
+    видимой отложенной публикации — смотря что позже.
+    """
+    key = f'blog:feed:last_modified:{get_feed_version()}'
+    now = timezone.now()
+    last_modified, valid_until = cache.get(key, (None, None))
+    if last_modified is not None and (
+        valid_until is None or valid_until > now
+    ):
+        return last_modified
+    changed_at = cache.get_or_set(FEED_CHANGED_AT_KEY, now, timeout=None)
+    published = (
+        Post.objects.filter(is_visible=True, pub_date__lte=now)
+        .order_by('-pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+    last_modified = max(changed_at, published or changed_at)
+    next_change = next_visibility_change()
+    cache.set(
+        key, (last_modified, next_change), feed_cache_timeout(next_change)
+    )
+    return last_modified
+
+
+def feed_cache_timeout(next_change=None):
+    """Время жизни страницы ленты: не дольше, чем до следующей публикации."""
+    if next_change is None:
+        return FEED_CACHE_TIMEOUT
+    seconds = ceil((next_change - timezone.now()).total_seconds())
+    return max(0, min(FEED_CACHE_TIMEOUT, seconds))
+
+
+def _anonymous_feed_page(request, user):
+    """Номер страницы ленты, если её можно отдать из кеша, иначе None."""
+    page = request.GET.get('page', '1')
+    if (
+        user.is_authenticated
+        or request.method != 'GET'
+        or set(request.GET) - {'page'}
+        or not page.isdigit()
+    ):
+        return None
+    return page
+
+
+def _store_feed_page(key, response):
+    if response.status_code == 200:
+        cache.set(
+            key,
+            response.content,
+            feed_cache_timeout(next_visibility_change()),
+        )
+
+
+def cache_anonymous_feed(name):
+    """Отдавать анонимам готовый HTML страницы ленты из кеша."""
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                page = _anonymous_feed_page(request, await request.auser())
+                if page is None:
+                    return await view(request, *args, **kwargs)
+                key = await sync_to_async(feed_cache_key)(name, page)
+                content = await cache.aget(key)
+                if content is not None:
+                    return HttpResponse(content)
+                response = await view(request, *args, **kwargs)
+                await sync_to_async(_store_feed_page)(key, response)
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            page = _anonymous_feed_page(request, request.user)
+            if page is None:
+                return view(request, *args, **kwargs)
+            key = feed_cache_key(name, page)
+            content = cache.get(key)
+            if content is not None:
+                return HttpResponse(content)
+            response = view(request, *args, **kwargs)
+            _store_feed_page(key, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def page_validators():
+    """Last-Modified (в секундах) и ETag, общие для всех страниц блога."""
+    last_modified = feed_last_modified()
+    return (
+        int(last_modified.timestamp()),
+        f'"{get_feed_version()}-{last_modified.timestamp():.6f}"',
+    )
+
+
+def _with_validators(response, etag, timestamp):
+    response.headers.setdefault('ETag', etag)
+    response.headers.setdefault('Last-Modified', http_date(timestamp))
+    patch_cache_control(response, public=True, max_age=PAGE_MAX_AGE)
+    return response
+
+
+def _is_private(request, user):
+    return user.is_authenticated or request.method not in ('GET', 'HEAD')
+
+
+def conditional_page(view):
+    """Отвечать анонимам 304, если страница не менялась с их прошлого визита.
+
+    Валидаторы общие для всех страниц блога: версия лент и
+    feed_last_modified(), поэтому проверка не требует рендеринга.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if _is_private(request, await request.auser()):
+                response = await view(request, *args, **kwargs)
+                patch_cache_control(response, private=True)
+                return response
+            timestamp, etag = await sync_to_async(page_validators)()
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return _with_validators(response, etag, timestamp)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if _is_private(request, request.user):
+            response = view(request, *args, **kwargs)
+            patch_cache_control(response, private=True)
+            return response
+        timestamp, etag = page_validators()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return _with_validators(response, etag, timestamp)
+    return wrapper
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+from django.utils.module_loading import import_string
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Кеш лент должен быть общим для всех процессов сайта.
+
+    Иначе invalidate_feeds() сбрасывает ленты только в том процессе,
+    где изменились данные, а остальные отдают устаревшие страницы.
+    """
+    backend = import_string(settings.CACHES['default']['BACKEND'])
+    if not issubclass(backend, (LocMemCache, DummyCache)):
+        return []
+    return [Warning(
+        'Кеш default виден только текущему процессу: сброс лент '
+        'не дойдёт до остальных процессов сайта.',
+        hint=(
+            'Для нескольких процессов задайте общий кеш '
+            '(BLOGICUM_REDIS_URL) или запускайте сайт одним процессом.'
+        ),
+        id='blog.W001',
+    )]
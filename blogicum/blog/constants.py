@@ -3,3 +3,18 @@ POSTS_ON_PAGE = 10
 MAX_LENGTH = 256
 MAX_WORDS_LENGTH = 4
 MAX_TEXT = 50
+FEED_CACHE_TIMEOUT = 60 * 15
+THUMBNAIL_WIDTHS = (320, 640)
+THUMBNAIL_QUALITY = 80
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_INTERVAL = 1.0
+JOB_LEASE_TIMEOUT = 60 * 10
+COMMENTS_ON_PAGE = 20
+COMMENTS_ORDERING = ('created_at', 'id')
+EXPORT_CHUNK_SIZE = 2000
+PAGE_MAX_AGE = 60
+PAGE_WINDOW = 2
+EXCERPT_WORDS = 10
+# Записи моложе этого (в секундах) ждут следующей выгрузки: их
+# транзакции с более ранним created_at могут ещё не завершиться.
+EXPORT_SAFETY_MARGIN = 60
@@ -0,0 +1,117 @@
+import datetime
+import re
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.constants import EXPORT_CHUNK_SIZE, EXPORT_SAFETY_MARGIN
+from blog.models import Comment, Post
+
+EXPORT_ORDERING = ('created_at', 'id')
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'created_at': 'created_at',
+    'is_published': 'is_published',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location__name',
+    'comment_count': 'comment_count',
+}
+
+COMMENT_FIELDS = {
+    'id': 'id',
+    'post': 'post_id',
+    'author': 'author__username',
+    'text': 'text',
+    'created_at': 'created_at',
+    'is_published': 'is_published',
+}
+
+
+# «+» смещения в неэкранированной строке запроса приходит пробелом.
+UNENCODED_OFFSET = re.compile(r'(:\d\d(?:\.\d+)?) (\d\d:?\d\d)$')
+
+
+def parse_watermark(value):
+    """Разобрать отметку ``since``; None — если она не задана.
+
+    Понимает ``Z`` и смещение вида ``+00:00``, в том числе
+    с потерянным при передаче в URL «+».
+    """
+    if not value:
+        return None
+    watermark = parse_datetime(UNENCODED_OFFSET.sub(r'\1+\2', value))
+    if watermark is None:
+        raise ValueError(f'Некорректная дата: {value}')
+    if timezone.is_naive(watermark):
+        watermark = timezone.make_aware(watermark)
+    return watermark
+
+
+def format_watermark(value):
+    """Дата в ISO 8601; UTC записывается как ``Z``, безопасный в URL."""
+    if timezone.is_naive(value):
+        return value.isoformat()
+    return value.astimezone(datetime.timezone.utc).isoformat().replace(
+        '+00:00', 'Z'
+    )
+
+
+def export_until(since=None):
+    """Верхняя граница выгрузки и отметка для следующей.
+
+    Фиксируется в начале выгрузки с запасом EXPORT_SAFETY_MARGIN:
+    запись, созданная во время выгрузки или ещё не подтверждённая,
+    попадёт в следующую, а не потеряется за новой отметкой. Отметка
+    не отступает назад дальше ``since``.
+    """
+    until = timezone.now() - datetime.timedelta(seconds=EXPORT_SAFETY_MARGIN)
+    return until if since is None else max(since, until)
+
+
+def _records(model, fields, since, until, chunk_size):
+    queryset = model.objects.filter(created_at__lte=until)
+    if since is not None:
+        queryset = queryset.filter(created_at__gt=since)
+    rows = queryset.order_by(*EXPORT_ORDERING).values_list(
+        *fields.values()
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield dict(zip(fields, row))
+
+
+def export_records(since, until, chunk_size=EXPORT_CHUNK_SIZE):
+    """Публикации, затем комментарии, созданные в интервале (since, until].
+
+    Границы общие для обоих типов записей, поэтому ``until`` служит
+    отметкой ``since`` для следующей выгрузки.
+    """
+    for record_type, model, fields in (
+        ('post', Post, POST_FIELDS),
+        ('comment', Comment, COMMENT_FIELDS),
+    ):
+        for record in _records(model, fields, since, until, chunk_size):
+            yield {'type': record_type, **record}
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    """Даты без округления до миллисекунд: по ним считается отметка."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return format_watermark(o)
+        return super().default(o)
+
+
+def to_json_line(record, encoder=ExportEncoder(ensure_ascii=False)):
+    return encoder.encode(record) + '\n'
+
+
+def export_lines(since, until, chunk_size=EXPORT_CHUNK_SIZE):
+    for record in export_records(since, until, chunk_size):
+        yield to_json_line(record)
@@ -0,0 +1,104 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from blog.caching import invalidate_feeds
+from blog.constants import THUMBNAIL_QUALITY, THUMBNAIL_WIDTHS
+from blog.models import Post
+
+REENCODE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True},
+    'PNG': {'optimize': True},
+}
+
+
+def variant_name(name, width):
+    stem, _ = os.path.splitext(name)
+    return f'{stem}_{width}w.webp'
+
+
+def make_image_variants(image):
+    """Сохранить рядом с оригиналом WebP-копии для srcset.
+
+    Возвращает список {'width': ..., 'name': ...} от меньшей к большей.
+    """
+    with image.open('rb') as file, Image.open(file) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'RGBA'):
+            original = original.convert('RGBA')
+        widths = sorted(
+            {width for width in THUMBNAIL_WIDTHS if width < original.width}
+            | {original.width}
+        )
+        variants = []
+        for width in widths:
+            resized = original.resize(
+                (width, max(1, round(original.height * width
+                                     / original.width))),
+                Image.LANCZOS,
+            )
+            buffer = BytesIO()
+            resized.save(buffer, 'WEBP', quality=THUMBNAIL_QUALITY)
+            name = image.storage.save(
+                variant_name(image.name, width), ContentFile(buffer.getvalue())
+            )
+            variants.append({'width': width, 'name': name})
+    return variants
+
+
+def delete_image_variants(storage, variants):
+    for variant in variants:
+        storage.delete(variant['name'])
+
+
+def retain_image_variants(storage, variants):
+    for variant in variants:
+        storage.retain(variant['name'])
+
+
+def reencode_image(image):
+    """Пересохранить оригинал без EXIF; вернуть имя нового файла.
+
+    Анимированные изображения и форматы без известных настроек
+    остаются как есть — тогда возвращается None.
+    """
+    with image.open('rb') as file, Image.open(file) as original:
+        image_format = original.format
+        if (
+            image_format not in REENCODE_OPTIONS
+            or getattr(original, 'is_animated', False)
+        ):
+            return None
+        cleaned = ImageOps.exif_transpose(original)
+        if image_format == 'JPEG' and cleaned.mode not in ('RGB', 'L'):
+            cleaned = cleaned.convert('RGB')
+        buffer = BytesIO()
+        cleaned.save(buffer, image_format, **REENCODE_OPTIONS[image_format])
+    return image.storage.save(image.name, ContentFile(buffer.getvalue()))
+
+
+def process_post_image(post_id):
+    """Фоновая обработка картинки поста: очистка EXIF и копии для srcset."""
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    storage = post.image.storage
+    source = post.image.name
+    cleaned = reencode_image(post.image)
+    if cleaned:
+        post.image.name = cleaned
+    variants = make_image_variants(post.image)
+    updated = Post.objects.filter(pk=post_id, image=source).update(
+        image=post.image.name, image_variants=variants
+    )
+    if not updated:
+        # Картинку успели заменить, пока шла обработка.
+        delete_image_variants(storage, variants)
+        if cleaned:
+            storage.delete(cleaned)
+        return
+    if cleaned:
+        storage.delete(source)
+    invalidate_feeds()
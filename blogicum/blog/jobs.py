@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from blog.constants import JOB_LEASE_TIMEOUT, JOB_MAX_ATTEMPTS
+from blog.models import Job
+
+HANDLERS = {
+    'process_post_image': 'blog.images.process_post_image',
+}
+
+
+def enqueue(kind, **payload):
+    if kind not in HANDLERS:
+        raise ValueError(f'Неизвестный тип задачи: {kind}')
+    return Job.objects.create(kind=kind, payload=payload)
+
+
+def requeue_stale_jobs(lease=JOB_LEASE_TIMEOUT):
+    """Вернуть в очередь задачи, которые выполняются дольше lease секунд.
+
+    Так задачи упавшего воркера не остаются в работе навсегда;
+    исчерпавшие попытки помечаются ошибкой.
+    """
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        updated_at__lt=timezone.now() - timedelta(seconds=lease),
+    )
+    failed = stale.filter(attempts__gte=JOB_MAX_ATTEMPTS).update(
+        status=Job.Status.FAILED,
+        error='Воркер не завершил задачу вовремя.',
+        updated_at=timezone.now(),
+    )
+    return failed + stale.update(
+        status=Job.Status.PENDING, updated_at=timezone.now()
+    )
+
+
+def claim_jobs(limit):
+    """Перевести до limit задач из очереди в работу и вернуть их id.
+
+    Задача достаётся тому, чей UPDATE первым сменил статус, поэтому
+    несколько воркеров не возьмут одну и ту же задачу.
+    """
+    requeue_stale_jobs()
+    pending = (
+        Job.objects.filter(status=Job.Status.PENDING)
+        .order_by('created_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+    return [
+        job_id for job_id in list(pending)
+        if Job.objects.filter(pk=job_id, status=Job.Status.PENDING).update(
+            status=Job.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now(),
+        )
+    ]
+
+
+def run_job(job_id):
+    job = Job.objects.get(pk=job_id)
+    try:
+        import_string(HANDLERS[job.kind])(**job.payload)
+    except Exception as error:
+        Job.objects.filter(pk=job_id).update(
+            status=(
+                Job.Status.FAILED if job.attempts >= JOB_MAX_ATTEMPTS
+                else Job.Status.PENDING
+            ),
+            error=f'{type(error).__name__}: {error}',
+            updated_at=timezone.now(),
+        )
+        return False
+    Job.objects.filter(pk=job_id).update(
+        status=Job.Status.DONE, error='', updated_at=timezone.now()
+    )
+    return True
@@ -0,0 +1,242 @@
+import gzip
+import json
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers import base, python
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import FileField
+
+from blog.caching import invalidate_feeds
+from blog.images import retain_image_variants
+from blog.models import Category, Comment, Post
+from blog.utils import refresh_derived_data
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _open_array(file):
+    buffer = ''
+    while not buffer.strip():
+        chunk = file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return None
+        buffer += chunk
+    buffer = buffer.lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Ожидался JSON-массив объектов.')
+    return buffer[1:]
+
+
+def iter_json_array(file):
+    """Отдавать элементы JSON-массива по одному, не читая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer = _open_array(file)
+    if buffer is None:
+        return
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,')
+        if buffer.startswith(']'):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise CommandError('Дамп оборван посреди JSON-массива.')
+            buffer += chunk
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+def iter_json_lines(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def open_dump(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+@contextmanager
+def preserved_timestamps(models):
+    """Не давать auto_now/auto_now_add затирать даты из дампа."""
+    flags = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(
+                field, 'auto_now_add', False
+            ):
+                flags.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class BulkLoader:
+    """Копит объекты по моделям и сохраняет их пачками."""
+
+    def __init__(self, using, batch_size, ignore_conflicts, log):
+        self.using = using
+        self.batch_size = batch_size
+        self.ignore_conflicts = ignore_conflicts
+        self.log = log
+        self.pending = {}
+        self.loaded = {}
+
+    def add(self, deserialized):
+        model = type(deserialized.object)
+        batch = self.pending.setdefault(model, [])
+        batch.append(deserialized)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        batch = self.pending.pop(model, [])
+        if not batch:
+            return
+        if model._meta.parents:
+            raise CommandError(
+                f'{model._meta.label}: bulk_create не поддерживает '
+                'наследование таблиц.'
+            )
+        objects = [item.object for item in batch]
+        with transaction.atomic(using=self.using):
+            model._base_manager.using(self.using).bulk_create(
+                objects, **self.conflict_options(model)
+            )
+            self.save_m2m(model, batch)
+            self.retain_files(model, objects)
+        self.loaded[model] = self.loaded.get(model, 0) + len(batch)
+        self.log(f'{model._meta.label}: {self.loaded[model]}')
+
+    def conflict_options(self, model):
+        """Объект с уже занятым pk обновляется, как в loaddata."""
+        fields = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        if self.ignore_conflicts or not fields:
+            return {'ignore_conflicts': True}
+        return {
+            'update_conflicts': True,
+            'unique_fields': [model._meta.pk.name],
+            'update_fields': fields,
+        }
+
+    def retain_files(self, model, objects):
+        """Учесть ссылки на файлы из дампа: bulk_create минует save()."""
+        fields = [
+            field for field in model._meta.concrete_fields
+            if isinstance(field, FileField)
+            and hasattr(field.storage, 'retain')
+        ]
+        for obj in objects:
+            for field in fields:
+                name = getattr(obj, field.attname).name
+                if name:
+                    field.storage.retain(name)
+            if model is Post and obj.image.name:
+                retain_image_variants(obj.image.storage, obj.image_variants)
+
+    def save_m2m(self, model, batch):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            rows = [
+                through(**{
+                    f'{field.m2m_field_name()}_id': item.object.pk,
+                    f'{field.m2m_reverse_field_name()}_id': value,
+                })
+                for item in batch
+                for value in item.m2m_data.get(field.name, ())
+            ]
+            through._base_manager.using(self.using).bulk_create(
+                rows, ignore_conflicts=True
+            )
+
+    def flush_all(self):
+        for model in list(self.pending):
+            self.flush(model)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает дамп JSON/JSONL (формат dumpdata) пачками '
+        'через bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump', help='Файл .json, .jsonl или .gz.')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--exclude', action='append', default=[],
+            help='Пропустить модель app_label.ModelName (можно повторять).',
+        )
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help=(
+                'Пропускать объекты, которые уже есть в базе, '
+                'а не обновлять их.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        path = options['dump']
+        loader = BulkLoader(
+            using=using,
+            batch_size=options['batch_size'],
+            ignore_conflicts=options['ignore_conflicts'],
+            log=self.stdout.write if options['verbosity'] > 1 else (
+                lambda message: None
+            ),
+        )
+        exclude = {label.lower() for label in options['exclude']}
+        is_lines = path.removesuffix('.gz').endswith('.jsonl')
+        try:
+            with (
+                open_dump(path) as file,
+                preserved_timestamps(apps.get_models()),
+                connection.constraint_checks_disabled(),
+            ):
+                items = (iter_json_lines if is_lines else iter_json_array)(
+                    file
+                )
+                for deserialized in python.Deserializer(
+                    (
+                        item for item in items
+                        if item['model'].lower() not in exclude
+                    ),
+                    using=using,
+                    ignorenonexistent=True,
+                    handle_forward_references=False,
+                ):
+                    loader.add(deserialized)
+                loader.flush_all()
+        except (OSError, base.DeserializationError) as error:
+            raise CommandError(f'Не удалось загрузить {path}: {error}')
+        models = list(loader.loaded)
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in models]
+        )
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        if {Post, Comment, Category} & set(models):
+            refresh_derived_data(Post.objects.using(using))
+            invalidate_feeds()
+        self.stdout.write(self.style.SUCCESS('Загружено: ' + ', '.join(
+            f'{model._meta.label} — {count}'
+            for model, count in loader.loaded.items()
+        )))
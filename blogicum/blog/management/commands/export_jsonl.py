@@ -0,0 +1,59 @@
+from contextlib import ExitStack
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.export import (
+    export_records,
+    export_until,
+    format_watermark,
+    parse_watermark,
+    to_json_line,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает публикации и комментарии в формате JSON Lines; '
+        'с --since — только созданные после отметки. Записи последних '
+        'EXPORT_SAFETY_MARGIN секунд попадут в следующую выгрузку.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Отметка created_at (ISO 8601) предыдущей выгрузки.',
+        )
+        parser.add_argument(
+            '--output', '-o',
+            help='Файл для выгрузки; по умолчанию — стандартный вывод.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_watermark(options['since'])
+        except ValueError as error:
+            raise CommandError(error)
+        count, until = 0, export_until(since)
+        with ExitStack() as stack:
+            if options['output']:
+                write = stack.enter_context(
+                    open(options['output'], 'w', encoding='utf-8')
+                ).write
+            else:
+                write = partial(self.stdout.write, ending='')
+            for record in export_records(
+                since, until, options['chunk_size']
+            ):
+                write(to_json_line(record))
+                count += 1
+        # Отметку пишем в stderr, чтобы не смешивать её с данными.
+        self.stderr.write(
+            f'Выгружено записей: {count}; следующая отметка: '
+            f'{format_watermark(until)}',
+            style_func=self.style.SUCCESS,
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.utils import fill_excerpts
+
+
+class Command(BaseCommand):
+    help = 'Заполняет анонсы публикаций (поле excerpt) по их текстам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать все анонсы, а не только пустые.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if not options['all']:
+            posts = posts.filter(excerpt='')
+        updated = fill_excerpts(posts, options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Заполнено анонсов: {updated}')
+        )
@@ -0,0 +1,21 @@
+from django.core.management.commands import loaddata
+
+from blog.caching import invalidate_feeds
+from blog.models import Category, Comment, Post
+from blog.utils import refresh_derived_data
+
+
+class Command(loaddata.Command):
+    help = (
+        loaddata.Command.help
+        + ' Затем пересчитывает производные данные блога: фикстуры '
+        'сохраняются в обход save() и сигналов.'
+    )
+
+    def loaddata(self, fixture_labels):
+        # Вызывается внутри транзакции handle(), так что пересчёт
+        # откатится вместе с неудачной загрузкой.
+        super().loaddata(fixture_labels)
+        if {Post, Comment, Category} & self.models:
+            refresh_derived_data(Post.objects.using(self.using))
+            invalidate_feeds()
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from blog.caching import invalidate_feeds
+from blog.images import delete_image_variants, make_image_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные WebP-копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии и у публикаций, где они уже есть.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only('image', 'image_variants')
+        if not options['force']:
+            posts = posts.filter(image_variants=[])
+        done = failed = 0
+        for post in posts.iterator():
+            try:
+                variants = make_image_variants(post.image)
+            except OSError as error:
+                failed += 1
+                self.stderr.write(f'{post.image.name}: {error}')
+                continue
+            delete_image_variants(post.image.storage, post.image_variants)
+            Post.objects.filter(pk=post.pk).update(image_variants=variants)
+            done += 1
+        if done:
+            # update() не вызывает сигналы, а страницы выводят srcset.
+            invalidate_feeds()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано: {done}, с ошибками: {failed}')
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.caching import invalidate_feeds
+from blog.utils import rebuild_feed_entries
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает записи лент (FeedEntry) по публикациям, например '
+        'после массового изменения данных в обход сигналов.'
+    )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_feed_entries()
+        invalidate_feeds()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей лент: {rebuilt}')
+        )
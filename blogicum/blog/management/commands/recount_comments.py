@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.utils import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поле comment_count у публикаций.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recount_comments(Post.objects.all())
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}')
+        )
@@ -0,0 +1,64 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand
+
+from blog.constants import JOB_POLL_INTERVAL
+from blog.jobs import claim_jobs, run_job
+from blog.worker import init_worker, run_job_in_worker
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди (обработка изображений).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Число процессов; 0 — выполнять задачи в текущем процессе.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=JOB_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        if processes <= 0:
+            return self.loop(lambda job_ids: map(run_job, job_ids), 1, options)
+        with ProcessPoolExecutor(
+            processes,
+            mp_context=get_context('spawn'),
+            initializer=init_worker,
+        ) as pool:
+            self.loop(
+                lambda job_ids: pool.map(run_job_in_worker, job_ids),
+                processes,
+                options,
+            )
+
+    def loop(self, run_batch, batch_size, options):
+        done = failed = 0
+        while True:
+            job_ids = claim_jobs(batch_size)
+            if not job_ids:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+            for ok in run_batch(job_ids):
+                done += ok
+                failed += not ok
+        self.stdout.write(
+            self.style.SUCCESS(f'Выполнено: {done}, с ошибками: {failed}')
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(default=list, editable=False, verbose_name='Варианты изображения'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.1 on 2026-10-18 18:29
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def count_file_references(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    StoredFile = apps.get_model('blog', 'StoredFile')
+    refs = Counter()
+    for image, variants in Post.objects.exclude(image='').values_list(
+        'image', 'image_variants'
+    ).iterator():
+        refs[image] += 1
+        refs.update(variant['name'] for variant in variants)
+    StoredFile.objects.bulk_create(
+        StoredFile(name=name, refs=count) for name, count in refs.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('name', models.CharField(max_length=256, primary_key=True, serialize=False, verbose_name='Путь в хранилище')),
+                ('refs', models.PositiveIntegerField(default=0, verbose_name='Ссылок')),
+            ],
+            options={
+                'verbose_name': 'файл',
+                'verbose_name_plural': 'Файлы',
+            },
+        ),
+        migrations.RunPython(count_file_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.1.1 on 2026-10-18 18:31
+
+import blog.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize(column):
+    # unicode61 не приравнивает «ё» к «е», поэтому складываем заранее.
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN "
+    "INSERT INTO blog_post_fts (rowid, title, text) VALUES "
+    f"(new.id, {normalize('new.title')}, {normalize('new.text')}); END",
+    "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+    "ON blog_post BEGIN UPDATE blog_post_fts SET "
+    f"title = {normalize('new.title')}, text = {normalize('new.text')} "
+    "WHERE rowid = new.id; END",
+    "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN "
+    "DELETE FROM blog_post_fts WHERE rowid = old.id; END",
+    "INSERT INTO blog_post_fts (rowid, title, text) "
+    f"SELECT id, {normalize('title')}, {normalize('text')} FROM blog_post",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+    "DROP TRIGGER IF EXISTS blog_post_fts_update",
+    "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+    "DROP TABLE IF EXISTS blog_post_fts",
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_stored_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='blog.post')),
+                ('title', models.TextField()),
+                ('text', models.TextField()),
+                ('document', blog.models.SearchDocumentField(db_column='blog_post_fts')),
+            ],
+            options={
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(
+            run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)
+        ),
+    ]
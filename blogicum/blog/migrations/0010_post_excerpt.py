@@ -0,0 +1,56 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:05
+
+import importlib
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+
+# Добавление NOT NULL-столбца в SQLite пересоздаёт таблицу blog_post,
+# а вместе с ней пропадают триггеры поискового индекса. Удаление столбца
+# (DROP COLUMN) их сохраняет, поэтому перед созданием старые удаляются:
+# так шаг верен при любом способе изменения таблицы.
+search_index = importlib.import_module(
+    'blog.migrations.0008_post_search_index'
+)
+restore_triggers = search_index.run_on_sqlite([
+    *(
+        statement for statement in search_index.DROP_SQL
+        if statement.startswith('DROP TRIGGER')
+    ),
+    *(
+        statement for statement in search_index.CREATE_SQL
+        if statement.startswith('CREATE TRIGGER')
+    ),
+])
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('pk', 'text').iterator(BATCH_SIZE):
+        post.excerpt = Truncator(post.text).words(10, truncate=' …')
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_export_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Начало текста для лент; заполняется автоматически.', verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_feed_entries(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).values_list(
+        'pk', 'category_id', 'author_id', 'pub_date', 'comment_count'
+    )
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(
+                post_id=post_id,
+                category_id=category_id,
+                author_id=author_id,
+                visible_at=pub_date,
+                comment_count=comments,
+            )
+            for post_id, category_id, author_id, pub_date, comments
+            in posts.iterator(BATCH_SIZE)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_excerpt'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('visible_at', models.DateTimeField(verbose_name='Видна с')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментарии')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Записи лент',
+                'ordering': ('-visible_at', '-post_id'),
+                'default_related_name': 'feed_entries',
+                'indexes': [models.Index(fields=['-visible_at', '-post'], name='feed_visible_at_idx'), models.Index(fields=['category', '-visible_at', '-post'], name='feed_category_visible_at_idx'), models.Index(fields=['author', '-visible_at', '-post'], name='feed_author_visible_at_idx')],
+            },
+        ),
+        migrations.RunPython(fill_feed_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:14
+
+import importlib
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Q
+
+# Новый NOT NULL-столбец снова пересоздаёт blog_post без триггеров,
+# а откат удаляет столбец на месте и триггеры сохраняет; restore_triggers
+# из 0010 сначала удаляет их, поэтому годится для обоих направлений.
+restore_triggers = importlib.import_module(
+    'blog.migrations.0010_post_excerpt'
+).restore_triggers
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Category = apps.get_model('blog', 'Category')
+    Post.objects.update(
+        is_visible=Q(is_published=True) & Exists(
+            Category.objects.filter(
+                pk=OuterRef('category_id'), is_published=True
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_feed_entry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_triggers),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_pub_date_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, help_text='Опубликована сама и в опубликованной категории; ведётся автоматически.', verbose_name='Видна в лентах'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date', '-id'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+        migrations.RunPython(restore_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:02
+
+import importlib
+
+from django.db import migrations
+
+# Индекс по-прежнему строится по тексту со сложенной «ё», но таблица
+# становится external content: snippet() и столбцы title/text читаются
+# из blog_post, поэтому в результатах поиска текст автора не меняется.
+# Замена «ё» на «е» не сдвигает границы слов, так что позиции совпадений
+# в индексе и в исходном тексте одни и те же.
+search_index = importlib.import_module(
+    'blog.migrations.0008_post_search_index'
+)
+normalize = search_index.normalize
+
+
+def index_row(prefix=''):
+    return (
+        f"{prefix}id, {normalize(f'{prefix}title')}, "
+        f"{normalize(f'{prefix}text')}"
+    )
+
+
+# Удаление из external content таблицы требует тех же значений,
+# что были проиндексированы.
+DELETE_OLD = (
+    "INSERT INTO blog_post_fts (blog_post_fts, rowid, title, text) "
+    f"VALUES ('delete', {index_row('old.')});"
+)
+INSERT_NEW = (
+    "INSERT INTO blog_post_fts (rowid, title, text) "
+    f"VALUES ({index_row('new.')});"
+)
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+    "title, text, content = 'blog_post', content_rowid = 'id', "
+    "tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN "
+    f"{INSERT_NEW} END",
+    "CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text "
+    f"ON blog_post BEGIN {DELETE_OLD} {INSERT_NEW} END",
+    "CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN "
+    f"{DELETE_OLD} END",
+    "INSERT INTO blog_post_fts (rowid, title, text) "
+    f"SELECT {index_row()} FROM blog_post",
+]
+DROP_SQL = search_index.DROP_SQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            search_index.run_on_sqlite([*DROP_SQL, *CREATE_SQL]),
+            search_index.run_on_sqlite([*DROP_SQL, *search_index.CREATE_SQL]),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:20
+
+from django.db import migrations
+
+
+def drop_image_index(apps, schema_editor):
+    # Прежняя 0007 индексировала Post.image; в базах, где она уже
+    # применена, индекс остался, хотя по имени файла посты не ищутся.
+    # DROP INDEX не пересоздаёт blog_post и не трогает триггеры поиска.
+    Post = apps.get_model('blog', 'Post')
+    connection = schema_editor.connection
+    table = Post._meta.db_table
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    for name, constraint in constraints.items():
+        if (
+            constraint['index']
+            and not constraint['unique']
+            and constraint['columns'] == ['image']
+        ):
+            schema_editor.execute(
+                f'DROP INDEX {schema_editor.quote_name(name)}'
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_search_index_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_image_index, migrations.RunPython.noop),
+    ]
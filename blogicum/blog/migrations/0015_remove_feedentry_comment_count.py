@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:35
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def restore_comment_counts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    FeedEntry.objects.update(
+        comment_count=Subquery(
+            Post.objects.filter(pk=OuterRef('post')).values('comment_count')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_drop_post_image_index'),
+    ]
+
+    operations = [
+        # Ленты выводят счётчик из строки поста; копия в записи ленты
+        # только добавляла UPDATE к каждой записи комментария.
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_comment_counts
+        ),
+        migrations.RemoveField(
+            model_name='feedentry',
+            name='comment_count',
+        ),
+    ]
@@ -1,12 +1,20 @@
+import hashlib
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils.text import Truncator
 
-from blog.constants import MAX_LENGTH, MAX_WORDS_LENGTH
+from blog.constants import EXCERPT_WORDS, MAX_LENGTH, MAX_WORDS_LENGTH
 
 User = get_user_model()
 
 
+def make_excerpt(text):
+    """Анонс для лент — то же, что даёт фильтр truncatewords."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
 class PublishedBaseModel(models.Model):
     is_published = models.BooleanField(
         default=True,
@@ -68,6 +76,12 @@ class Post(PublishedBaseModel):
         verbose_name="Заголовок",
     )
     text = models.TextField(verbose_name="Текст")
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Анонс",
+        help_text="Начало текста для лент; заполняется автоматически.",
+    )
     pub_date = models.DateTimeField(
         verbose_name="Дата и время публикации",
         help_text=(
@@ -98,12 +112,51 @@ class Post(PublishedBaseModel):
         upload_to="posts_images",
         blank=True,
     )
+    image_variants = models.JSONField(
+        default=list,
+        editable=False,
+        verbose_name="Варианты изображения",
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Комментарии",
+        help_text="Число опубликованных комментариев; ведётся автоматически.",
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Видна в лентах",
+        help_text=(
+            "Опубликована сама и в опубликованной категории; "
+            "ведётся автоматически."
+        ),
+    )
 
     class Meta:
         default_related_name = "posts"
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(
+                fields=("-pub_date", "-id"),
+                condition=models.Q(is_visible=True),
+                name="post_visible_pub_date_idx",
+            ),
+            models.Index(
+                fields=("category", "-pub_date", "-id"),
+                name="post_category_pub_date_idx",
+            ),
+            models.Index(
+                fields=("author", "-pub_date", "-id"),
+                name="post_author_pub_date_idx",
+            ),
+            models.Index(
+                fields=("created_at", "id"),
+                name="post_created_at_idx",
+            ),
+        )
 
     def __str__(self):
         return self.title[:MAX_WORDS_LENGTH]
@@ -111,6 +164,141 @@ class Post(PublishedBaseModel):
     def get_absolute_url(self):
         return reverse("blog:post_detail", args=[self.pk])
 
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None or "text" in update_fields:
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None:
+                update_fields = {*update_fields, "excerpt"}
+        if update_fields is None or {"is_published", "category"} & set(
+            update_fields
+        ):
+            self.is_visible = self.is_published and bool(
+                self.category and self.category.is_published
+            )
+            if update_fields is not None:
+                update_fields = {*update_fields, "is_visible"}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    @property
+    def card_version(self):
+        """Отпечаток всего, что выводит карточка публикации.
+
+        Меняется вместе с карточкой, поэтому её кеш не нужно сбрасывать.
+        """
+        category, location = self.category, self.location
+        fingerprint = (
+            self.title,
+            self.excerpt,
+            self.pub_date.isoformat(),
+            self.is_published,
+            self.image.name,
+            self.image_variants,
+            self.comment_count,
+            self.author.username,
+            category
+            and (category.slug, category.title, category.is_published),
+            location and (location.name, location.is_published),
+        )
+        return hashlib.md5(
+            repr(fingerprint).encode(), usedforsecurity=False
+        ).hexdigest()
+
+    @property
+    def image_srcset(self):
+        storage = self.image.storage
+        return ", ".join(
+            f"{storage.url(variant['name'])} {variant['width']}w"
+            for variant in self.image_variants
+        )
+
+
+class SearchDocumentField(models.TextField):
+    """Скрытый столбец FTS5-таблицы, совпадающий с её именем."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class PostSearchIndex(models.Model):
+    """Полнотекстовый индекс FTS5 по публикациям.
+
+    Таблица и триггеры синхронизации создаются миграцией, поэтому
+    модель неуправляемая. Индекс строится по тексту, где «ё» заменена
+    на «е», а title и text читаются из blog_post без изменений.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        related_name="search_index",
+    )
+    title = models.TextField()
+    text = models.TextField()
+    document = SearchDocumentField(db_column="blog_post_fts")
+
+    class Meta:
+        managed = False
+        db_table = "blog_post_fts"
+
+
+class FeedEntry(models.Model):
+    """Запись материализованной ленты.
+
+    Есть только у опубликованных постов из опубликованных категорий;
+    ведётся сигналами при записи и пересобирается командой rebuild_feed.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="feed_entry",
+        verbose_name="Публикация",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        verbose_name="Категория",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name="Автор публикации",
+    )
+    visible_at = models.DateTimeField(verbose_name="Видна с")
+
+    class Meta:
+        default_related_name = "feed_entries"
+        verbose_name = "запись ленты"
+        verbose_name_plural = "Записи лент"
+        ordering = ("-visible_at", "-post_id")
+        indexes = (
+            models.Index(
+                fields=("-visible_at", "-post"),
+                name="feed_visible_at_idx",
+            ),
+            models.Index(
+                fields=("category", "-visible_at", "-post"),
+                name="feed_category_visible_at_idx",
+            ),
+            models.Index(
+                fields=("author", "-visible_at", "-post"),
+                name="feed_author_visible_at_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.post_id} ({self.visible_at})"
+
 
 class Comment(PublishedBaseModel):
     post = models.ForeignKey(
@@ -130,6 +318,73 @@ class Comment(PublishedBaseModel):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at"),
+                name="comment_post_created_at_idx",
+            ),
+            models.Index(
+                fields=("created_at", "id"),
+                name="comment_created_at_idx",
+            ),
+        )
 
     def __str__(self):
         return f'Комментарий {self.text[:MAX_WORDS_LENGTH]} от {self.author}'
+
+
+class Job(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Выполнено"
+        FAILED = "failed", "Ошибка"
+
+    kind = models.CharField(max_length=64, verbose_name="Тип задачи")
+    payload = models.JSONField(default=dict, verbose_name="Параметры")
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Попыток",
+    )
+    error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Добавлено",
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+
+    class Meta:
+        verbose_name = "фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("status", "created_at"),
+                name="job_status_created_at_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class StoredFile(models.Model):
+    name = models.CharField(
+        max_length=MAX_LENGTH,
+        primary_key=True,
+        verbose_name="Путь в хранилище",
+    )
+    refs = models.PositiveIntegerField(default=0, verbose_name="Ссылок")
+
+    class Meta:
+        verbose_name = "файл"
+        verbose_name_plural = "Файлы"
+
+    def __str__(self):
+        return f"{self.name} ({self.refs})"
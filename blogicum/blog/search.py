@@ -0,0 +1,95 @@
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, TextField, Value
+from django.db.models.functions import Left
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+SEARCH_ORDERING = ('rank', 'id')
+HIGHLIGHT_START, HIGHLIGHT_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+TITLE_WEIGHT, TEXT_WEIGHT = 10.0, 1.0
+MIN_STEM_LENGTH = 3
+RUSSIAN_ENDINGS = sorted(
+    (
+        'иями ями ами ией ого его ому ему ыми ими ая яя ое ее ые ие ый ий '
+        'ой ей ом ем ам ям ах ях ов ев ую юю ия ию ть а я о е ы и у ю ь й'
+    ).split(),
+    key=len,
+    reverse=True,
+)
+
+
+def stem(word):
+    """Отбросить типичное русское окончание, чтобы искать по префиксу."""
+    for ending in RUSSIAN_ENDINGS:
+        if (
+            word.endswith(ending)
+            and len(word) - len(ending) >= MIN_STEM_LENGTH
+        ):
+            return word[:-len(ending)]
+    return word
+
+
+def normalize_words(query):
+    return re.findall(r'\w+', query.lower().replace('ё', 'е'))
+
+
+def build_match_query(query):
+    """Превратить ввод пользователя в безопасный запрос FTS5.
+
+    Каждое слово берётся в кавычки, поэтому операторы FTS5 из ввода
+    не интерпретируются; все слова должны встретиться в документе.
+    """
+    return ' '.join(f'"{stem(word)}"*' for word in normalize_words(query))
+
+
+class BM25(Func):
+    function = 'bm25'
+    output_field = FloatField()
+
+
+class Snippet(Func):
+    function = 'snippet'
+    output_field = TextField()
+
+
+def search_posts(queryset, query):
+    """Отфильтровать queryset по запросу и добавить rank и snippet.
+
+    Меньший rank — более релевантный результат.
+    """
+    match_query = build_match_query(query)
+    if not match_query:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        condition = Q()
+        for word in normalize_words(query):
+            condition &= (
+                Q(title__icontains=stem(word)) | Q(text__icontains=stem(word))
+            )
+        return queryset.filter(condition).annotate(
+            rank=Value(0.0, output_field=FloatField()),
+            snippet=Left('text', SNIPPET_TOKENS * 8),
+        )
+    document = F('search_index__document')
+    return queryset.filter(search_index__document__match=match_query).annotate(
+        rank=BM25(document, Value(TITLE_WEIGHT), Value(TEXT_WEIGHT)),
+        snippet=Snippet(
+            document,
+            Value(-1),
+            Value(HIGHLIGHT_START),
+            Value(HIGHLIGHT_END),
+            Value('…'),
+            Value(SNIPPET_TOKENS),
+        ),
+    )
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_END, '</mark>')
+    )
@@ -0,0 +1,168 @@
+from django.conf import settings
+from django.db.models import Q, QuerySet, Value
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from blog.caching import invalidate_feeds
+from blog.images import delete_image_variants
+from blog.jobs import enqueue
+from blog.models import Category, Comment, Location, Post
+from blog.utils import (
+    recount_comments,
+    sync_feed_entries,
+)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, **kwargs):
+    instance._previous_post_id = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_post_id = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list('post_id', flat=True)
+        .first()
+    )
+
+
+def is_cascade(sender, origin=None):
+    """Объект удаляется каскадом вслед за объектом другой модели."""
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return not issubclass(model, sender)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def update_comment_count(sender, instance, raw=False, origin=None, **kwargs):
+    # Вслед за постом комментарии удаляются вместе с ним, а за
+    # пользователем — пересчитываются в update_commented_posts().
+    if raw or is_cascade(sender, origin):
+        return
+    post_ids = {instance.post_id, getattr(instance, '_previous_post_id', None)}
+    post_ids.discard(None)
+    recount_comments(Post.objects.filter(pk__in=post_ids))
+
+
+@receiver(post_save, sender=Post)
+def update_feed_entry(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_feed_entries(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_visibility(sender, instance, raw=False, **kwargs):
+    instance._was_published = None
+    if raw or instance.pk is None:
+        return
+    instance._was_published = (
+        Category.objects.filter(pk=instance.pk)
+        .values_list('is_published', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_category_visibility(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_was_published', None)
+    if raw or previous is None or previous == instance.is_published:
+        return
+    # Один UPDATE по индексу category_id, сколько бы постов ни было.
+    posts = instance.posts.all()
+    posts.update(
+        is_visible=(
+            Q(is_published=True) if instance.is_published else Value(False)
+        )
+    )
+    sync_feed_entries(posts)
+
+
+@receiver(post_delete, sender=Category)
+def hide_posts_without_category(sender, instance, **kwargs):
+    # Посты удалённой категории остаются без неё (SET_NULL).
+    Post.objects.filter(category=None, is_visible=True).update(
+        is_visible=False
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def reset_feed_cache(sender, origin=None, **kwargs):
+    # При каскаде версию лент сменит удаление самого origin.
+    if not is_cascade(sender, origin):
+        invalidate_feeds()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reset_feed_cache_on_profile_change(
+    sender, update_fields=None, **kwargs
+):
+    # Имя автора выводится на страницах; вход в систему его не меняет.
+    if update_fields != frozenset({'last_login'}):
+        invalidate_feeds()
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def remember_commented_posts(sender, instance, **kwargs):
+    # Комментарии пользователя к чужим постам удалятся каскадом.
+    instance._commented_post_ids = list(
+        Comment.objects.filter(author=instance)
+        .exclude(post__author=instance)
+        .values_list('post_id', flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def update_commented_posts(sender, instance, **kwargs):
+    post_ids = getattr(instance, '_commented_post_ids', None)
+    if post_ids:
+        recount_comments(Post.objects.filter(pk__in=post_ids))
+    invalidate_feeds()
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_image(sender, instance, raw=False, **kwargs):
+    instance._previous_image = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_image = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('image', 'image_variants')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def schedule_image_processing(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_image', None)
+    previous_name, previous_variants = previous or ('', [])
+    if raw or previous_name == (instance.image.name or ''):
+        return
+    if previous_name:
+        instance.image.storage.delete(previous_name)
+    if previous_variants:
+        delete_image_variants(instance.image.storage, previous_variants)
+        instance.image_variants = []
+        Post.objects.filter(pk=instance.pk).update(image_variants=[])
+    if instance.image:
+        enqueue('process_post_image', post_id=instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    if instance.image:
+        instance.image.storage.delete(instance.image.name)
+    delete_image_variants(instance.image.storage, instance.image_variants)
@@ -0,0 +1,74 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит каждый уникальный файл один раз под его SHA-256.
+
+    Повторная загрузка того же содержимого возвращает уже сохранённое
+    имя и увеличивает счётчик ссылок; delete() удаляет файл с диска,
+    только когда счётчик доходит до нуля.
+    """
+
+    hash_name = 'sha256'
+
+    def digest_name(self, name, content):
+        digest = hashlib.new(self.hash_name)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, f'{digest.hexdigest()}{extension}')
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.digest_name(name, content)
+        # Ссылка учитывается до проверки файла: параллельный delete()
+        # увидит её и не удалит файл с диска.
+        self.retain(name)
+        if not self.exists(name):
+            saved = super().save(name, content, max_length=max_length)
+            if saved != name:
+                # То же содержимое успел записать параллельный запрос.
+                super().delete(saved)
+        return name
+
+    def retain(self, name):
+        stored_files = apps.get_model('blog', 'StoredFile').objects
+        if stored_files.filter(name=name).update(refs=F('refs') + 1):
+            return
+        try:
+            with transaction.atomic():
+                stored_files.create(name=name, refs=1)
+        except IntegrityError:
+            stored_files.filter(name=name).update(refs=F('refs') + 1)
+
+    def delete(self, name):
+        stored_files = apps.get_model('blog', 'StoredFile').objects
+        with transaction.atomic():
+            # Условный UPDATE: из двух параллельных delete() при refs=2
+            # уменьшит счётчик только один, второй удалит строку.
+            if stored_files.filter(name=name, refs__gt=1).update(
+                refs=F('refs') - 1
+            ):
+                return
+            stored_files.filter(name=name).delete()
+            # Файл удаляется только после фиксации транзакции: при откате
+            # строка и файл остаются на месте.
+            transaction.on_commit(lambda: self.delete_unreferenced(name))
+
+    def delete_unreferenced(self, name):
+        """Удалить файл, если на него так и не появилось новых ссылок."""
+        stored_files = apps.get_model('blog', 'StoredFile').objects
+        if not stored_files.filter(name=name).exists():
+            super().delete(name)
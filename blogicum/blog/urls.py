@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.urls import include, path
-from . import views
+from . import async_views, views
+
+# Страницы только для чтения есть и в асинхронном варианте.
+pages = async_views if settings.ASYNC_VIEWS else views
 
 app_name = 'blog'
 
 posts = [
     path('<int:post_id>/',
-         views.post_detail,
+         pages.post_detail,
          name='post_detail'),
     path('create/',
          views.create_post,
@@ -16,6 +20,9 @@ posts = [
     path('<int:post_id>/delete/',
          views.delete_post,
          name='delete_post'),
+    path('<int:post_id>/comments/',
+         views.post_comments,
+         name='post_comments'),
     path('<int:post_id>/comment/',
          views.add_comment,
          name='add_comment'),
@@ -28,15 +35,17 @@ posts = [
 ]
 
 urlpatterns = [
-    path('', views.index, name='index'),
+    path('', pages.index, name='index'),
+    path('search/', views.search, name='search'),
+    path('export/', views.export, name='export'),
     path('category/<slug:category_slug>/',
-         views.category_posts,
+         pages.category_posts,
          name='category_posts'),
     path('posts/', include(posts)),
     path('profile/edit_profile/',
          views.edit_profile,
          name='edit_profile'),
     path('profile/<str:username>/',
-         views.profile,
+         pages.profile,
          name='profile'),
 ]
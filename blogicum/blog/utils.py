@@ -1,29 +1,536 @@
+from collections.abc import Sequence
+from datetime import datetime
+from math import ceil
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db import connections, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from blog.models import Post
+from blog.caching import (
+    feed_cache_timeout,
+    get_feed_version,
+    next_visibility_change,
+)
+from blog.constants import PAGE_WINDOW, POSTS_ON_PAGE
+from blog.models import Category, Comment, FeedEntry, Post, make_excerpt
+
+CURSOR_SALT = 'blog.utils.cursor'
+# Поля visible_at и entry_id добавляет к ленте get_posts().
+CURSOR_ORDERING = ('-visible_at', '-entry_id')
+
+
+class CursorPage(Sequence):
+    """Страница, выбранная по ключу сортировки (например, pub_date, id).
+
+    В отличие от Paginator не нужны ни COUNT(*), ни OFFSET.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class WindowPage(Sequence):
+    """Номерная страница без COUNT(*) по всей ленте.
+
+    О следующей странице говорит лишняя строка выборки (per_page + 1),
+    номер последней страницы берётся из закешированного числа записей,
+    а ссылки выводятся только на соседние страницы.
+    """
+
+    def __init__(
+        self, object_list, number, has_next, last_page=None, known_pages=None
+    ):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+        self.last_page = last_page
+        self.page_links = _page_links(
+            number, last_page or known_pages or number,
+            more=last_page is None,
+        )
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+def _page_links(number, last, more=False, window=PAGE_WINDOW):
+    """Первая и последняя страницы плюс соседи текущей, с многоточиями."""
+    neighbours = range(max(1, number - window), min(last, number + window) + 1)
+    pages = sorted({1, last, *neighbours})
+    links, previous = [], 0
+    for page in pages:
+        if page - previous > 1:
+            links.append(Paginator.ELLIPSIS)
+        links.append(page)
+        previous = page
+    if more:
+        links.append(Paginator.ELLIPSIS)
+    return links
+
+
+def cached_count(queryset, key):
+    """Число записей ленты; пересчитывается после изменений в блоге."""
+    cache_key = f'blog:count:{get_feed_version()}:{key}'
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(
+            cache_key, count, feed_cache_timeout(next_visibility_change())
+        )
+    return count
 
 
-def posts_pagination(request, queryset, per_page=10):
-    return Paginator(queryset, per_page).get_page(request.GET.get('page'))
+async def acached_count(queryset, key):
+    cache_key = await sync_to_async(
+        lambda: f'blog:count:{get_feed_version()}:{key}'
+    )()
+    count = await cache.aget(cache_key)
+    if count is None:
+        count = await queryset.acount()
+        timeout = await sync_to_async(
+            lambda: feed_cache_timeout(next_visibility_change())
+        )()
+        await cache.aset(cache_key, count, timeout)
+    return count
+
+
+def _page_number(number):
+    try:
+        return max(1, int(number))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _last_page(total, per_page):
+    return None if total is None else max(1, ceil(total / per_page))
+
+
+def _pages_ahead(queryset, offset, per_page):
+    """Запрос с LIMIT: сколько записей есть в пределах окна ссылок."""
+    cap = (PAGE_WINDOW + 1) * per_page
+    return queryset.order_by().values('pk')[offset:offset + cap + 1]
+
+
+def _window_page(objects, number, per_page, last_page, ahead):
+    has_next = len(objects) > per_page
+    known_pages = number
+    if ahead is not None:
+        cap = (PAGE_WINDOW + 1) * per_page
+        known_pages = number - 1 + ceil(min(ahead, cap) / per_page)
+        if ahead <= cap:
+            last_page = known_pages
+    elif last_page is None:
+        last_page = number
+    return WindowPage(
+        objects[:per_page], number, has_next, last_page, known_pages
+    )
+
+
+def window_pagination(
+    queryset, number=None, per_page=POSTS_ON_PAGE, count_key=None
+):
+    """Постраничный вывод без COUNT(*) на каждый запрос.
+
+    С ``count_key`` номер последней страницы берётся из cached_count();
+    без него число страниц впереди оценивается запросом с LIMIT.
+    """
+    number = _page_number(number)
+    last_page = _last_page(
+        None if count_key is None else cached_count(queryset, count_key),
+        per_page,
+    )
+    if last_page is not None:
+        number = min(number, last_page)
+    offset = (number - 1) * per_page
+    objects = list(queryset[offset:offset + per_page + 1])
+    if not objects and number > 1:
+        # Номер за пределами ленты: как Paginator.get_page, отдаём последнюю.
+        last_page = _last_page(queryset.count(), per_page)
+        return window_pagination(queryset, last_page, per_page)
+    ahead = None
+    if last_page is None and len(objects) > per_page:
+        ahead = _pages_ahead(queryset, offset, per_page).count()
+    return _window_page(objects, number, per_page, last_page, ahead)
+
+
+async def awindow_pagination(
+    queryset, number=None, per_page=POSTS_ON_PAGE, count_key=None
+):
+    """То же, что window_pagination(), на асинхронном ORM."""
+    number = _page_number(number)
+    last_page = _last_page(
+        None if count_key is None
+        else await acached_count(queryset, count_key),
+        per_page,
+    )
+    if last_page is not None:
+        number = min(number, last_page)
+    offset = (number - 1) * per_page
+    objects = [obj async for obj in queryset[offset:offset + per_page + 1]]
+    if not objects and number > 1:
+        last_page = _last_page(await queryset.acount(), per_page)
+        return await awindow_pagination(queryset, last_page, per_page)
+    ahead = None
+    if last_page is None and len(objects) > per_page:
+        ahead = await _pages_ahead(queryset, offset, per_page).acount()
+    return _window_page(objects, number, per_page, last_page, ahead)
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def _cursor_salt(ordering):
+    # Курсор одной сортировки не должен приниматься другой.
+    return f'{CURSOR_SALT}:{",".join(ordering)}'
+
+
+def encode_cursor(obj, ordering=CURSOR_ORDERING, backwards=False):
+    values = [
+        _dump_value(getattr(obj, name.lstrip('-'))) for name in ordering
+    ]
+    return signing.dumps(
+        [values, backwards], salt=_cursor_salt(ordering), compress=True
+    )
+
+
+def decode_cursor(token, ordering=CURSOR_ORDERING):
+    """Вернуть (значения, backwards) или None для пустого/битого токена."""
+    if not token:
+        return None
+    try:
+        values, backwards = signing.loads(
+            token, salt=_cursor_salt(ordering)
+        )
+        if len(values) != len(ordering):
+            return None
+        return [_load_value(value) for value in values], bool(backwards)
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def _reverse_ordering(ordering):
+    return tuple(
+        name[1:] if name.startswith('-') else f'-{name}' for name in ordering
+    )
+
+
+def _after(ordering, values):
+    """Условие «строго после values» для сортировки ordering."""
+    condition, equal = Q(), {}
+    for name, value in zip(ordering, values):
+        field = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{field}__{lookup}': value})
+        equal[field] = value
+    return condition
+
+
+def _cursor_query(queryset, cursor, per_page, ordering):
+    """Срез на per_page + 1 записей от курсора и направление обхода.
+
+    Направление — None для первой страницы, иначе backwards из курсора.
+    """
+    position = decode_cursor(cursor, ordering)
+    if position is None:
+        return queryset.order_by(*ordering)[:per_page + 1], None
+    values, backwards = position
+    scan = _reverse_ordering(ordering) if backwards else ordering
+    return (
+        queryset.filter(_after(scan, values)).order_by(*scan)[:per_page + 1],
+        backwards,
+    )
+
+
+def _cursor_page(objects, backwards, per_page, ordering):
+    has_extra = len(objects) > per_page
+    objects = objects[:per_page]
+    if backwards is None:
+        has_more, has_before = has_extra, False
+    elif backwards:
+        objects.reverse()
+        has_more, has_before = True, has_extra
+    else:
+        has_more, has_before = has_extra, True
+    return CursorPage(
+        objects,
+        next_cursor=(
+            encode_cursor(objects[-1], ordering)
+            if objects and has_more else None
+        ),
+        previous_cursor=(
+            encode_cursor(objects[0], ordering, backwards=True)
+            if objects and has_before else None
+        ),
+    )
+
+
+def cursor_pagination(
+    queryset, cursor=None, per_page=POSTS_ON_PAGE, ordering=CURSOR_ORDERING
+):
+    query, backwards = _cursor_query(queryset, cursor, per_page, ordering)
+    return _cursor_page(list(query), backwards, per_page, ordering)
+
+
+async def acursor_pagination(
+    queryset, cursor=None, per_page=POSTS_ON_PAGE, ordering=CURSOR_ORDERING
+):
+    query, backwards = _cursor_query(queryset, cursor, per_page, ordering)
+    return _cursor_page(
+        [obj async for obj in query], backwards, per_page, ordering
+    )
+
+
+def _classic_pagination(queryset, number, per_page):
+    page = Paginator(queryset, per_page).get_page(number)
+    page.last_page = page.paginator.num_pages
+    page.page_links = page.paginator.get_elided_page_range(
+        page.number, on_each_side=PAGE_WINDOW, on_ends=1
+    )
+    return page
+
+
+def posts_pagination(
+    request, queryset, per_page=POSTS_ON_PAGE, count_key=None
+):
+    mode = getattr(settings, 'POSTS_PAGINATION', 'window')
+    if 'cursor' in request.GET or mode == 'cursor':
+        return cursor_pagination(
+            queryset, request.GET.get('cursor'), per_page
+        )
+    if mode == 'window':
+        return window_pagination(
+            queryset, request.GET.get('page'), per_page, count_key
+        )
+    return _classic_pagination(queryset, request.GET.get('page'), per_page)
+
+
+async def aposts_pagination(
+    request, queryset, per_page=POSTS_ON_PAGE, count_key=None
+):
+    mode = getattr(settings, 'POSTS_PAGINATION', 'window')
+    if 'cursor' in request.GET or mode == 'cursor':
+        return await acursor_pagination(
+            queryset, request.GET.get('cursor'), per_page
+        )
+    if mode == 'window':
+        return await awindow_pagination(
+            queryset, request.GET.get('page'), per_page, count_key
+        )
+    # Paginator синхронный: и страница, и её записи выбираются в потоке,
+    # чтобы шаблон не обращался к базе из цикла событий.
+    page = await sync_to_async(_classic_pagination)(
+        queryset, request.GET.get('page'), per_page
+    )
+    page.object_list = await sync_to_async(list)(page.object_list)
+    return page
+
+
+def recount_comments(posts=Post.objects.all()):
+    """Пересчитать сохранённое поле comment_count одним UPDATE."""
+    return posts.update(
+        comment_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(post=OuterRef('pk'), is_published=True)
+                .order_by()
+                .values('post')
+                .annotate(total=Count('pk'))
+                .values('total')
+            ),
+            0,
+        )
+    )
+
+
+def fill_excerpts(posts=Post.objects.all(), batch_size=1000):
+    """Пересчитать анонсы публикаций пачками, не трогая остальные поля."""
+    manager = Post.objects.db_manager(posts.db)
+    updated, batch = 0, []
+    for post in posts.only('pk', 'text').iterator(batch_size):
+        post.excerpt = make_excerpt(post.text)
+        batch.append(post)
+        if len(batch) == batch_size:
+            updated += manager.bulk_update(batch, ['excerpt'])
+            batch = []
+    return updated + manager.bulk_update(batch, ['excerpt'])
+
+
+def refresh_visibility(posts=Post.objects.all()):
+    """Пересчитать флаг is_visible одним UPDATE."""
+    return posts.update(
+        is_visible=Q(is_published=True) & Exists(
+            Category.objects.filter(
+                pk=OuterRef('category_id'), is_published=True
+            )
+        )
+    )
+
+
+def sync_feed_entries(posts=Post.objects.all()):
+    """Привести записи лент FeedEntry в соответствие с публикациями posts.
+
+    Сколько бы постов ни было, это два запроса: DELETE лишних записей
+    и INSERT … SELECT … ON CONFLICT DO UPDATE для видимых постов.
+    """
+    visible = posts.filter(is_visible=True)
+    FeedEntry.objects.db_manager(posts.db).filter(
+        post__in=posts.values('pk')
+    ).exclude(post__in=visible.values('pk')).delete()
+    return _upsert_feed_entries(visible)
+
+
+# Поле FeedEntry — поле Post, из которого оно копируется.
+FEED_ENTRY_SOURCES = {
+    'post': 'pk',
+    'category': 'category_id',
+    'author': 'author_id',
+    'visible_at': 'pub_date',
+}
+
+
+def _upsert_feed_entries(posts):
+    connection = connections[posts.db]
+    columns = [
+        FeedEntry._meta.get_field(name).column for name in FEED_ENTRY_SOURCES
+    ]
+    select, params = (
+        posts.order_by().values_list(*FEED_ENTRY_SOURCES.values())
+        .query.get_compiler(posts.db).as_sql()
+    )
+    quote = connection.ops.quote_name
+    # SELECT всегда с WHERE (is_visible), поэтому SQLite не спутает
+    # ON CONFLICT с условием соединения.
+    sql = 'INSERT INTO {} ({}) {} {}'.format(
+        quote(FeedEntry._meta.db_table),
+        ', '.join(map(quote, columns)),
+        select,
+        connection.ops.on_conflict_suffix_sql(
+            FeedEntry._meta.concrete_fields,
+            OnConflict.UPDATE,
+            columns[1:],
+            columns[:1],
+        ),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def rebuild_feed_entries():
+    """Пересобрать записи лент с нуля.
+
+    Счётчики комментариев и флаг is_visible пересчитываются заново:
+    записи лент копируют их, а правки в обход сигналов их не обновляют.
+    """
+    with transaction.atomic():
+        recount_comments()
+        refresh_visibility()
+        FeedEntry.objects.all().delete()
+        return sync_feed_entries()
+
+
+def refresh_derived_data(posts=Post.objects.all()):
+    """Пересчитать поля, которые при обычной записи ведут save() и сигналы.
+
+    Нужна после «сырой» загрузки (loaddata, bulk_loaddata): она сохраняет
+    объекты в обход save() и обработчиков сигналов.
+    """
+    # В фикстурах и дампах старых версий анонсов ещё нет.
+    fill_excerpts(posts.filter(excerpt=''))
+    recount_comments(posts)
+    refresh_visibility(posts)
+    sync_feed_entries(posts)
+
+
+def published_posts_filter():
+    """Условие видимости публикации для всех, кроме её автора."""
+    return Q(is_visible=True, pub_date__lt=timezone.now())
+
+
+def visible_posts(user):
+    """Свои публикации — любые, чужие — только опубликованные."""
+    visible = published_posts_filter()
+    if user.is_authenticated:
+        visible |= Q(author=user)
+    # Страница публикации показывает полный текст.
+    return get_posts(apply_filters=False).defer(None).filter(visible)
 
 
 def get_posts(
     posts=Post.objects.all(),
     apply_filters=True,
-    with_comments_count=True,
     use_select_related=True,
+    **feed,
 ):
+    """Публикации для лент, упорядоченные по CURSOR_ORDERING.
+
+    Опубликованные посты выбираются по записям FeedEntry без соединения
+    с категориями; ``feed`` ограничивает ленту по их полям (category,
+    author), чтобы выборка шла по индексу записей лент.
+    """
     if use_select_related:
         posts = posts.select_related('author', 'location', 'category')
     if apply_filters:
         posts = posts.filter(
-            is_published=True,
-            pub_date__lt=timezone.now(),
-            category__is_published=True,
-        )
-    if with_comments_count:
-        posts = posts.annotate(comment_count=Count('comments'))
-        posts = posts.order_by(*Post._meta.ordering)
-    return posts
+            feed_entry__visible_at__lt=timezone.now(),
+            **{f'feed_entry__{name}': value for name, value in feed.items()},
+        ).annotate(
+            visible_at=F('feed_entry__visible_at'),
+            entry_id=F('feed_entry__post_id'),
+        )
+    else:
+        posts = posts.filter(**feed).annotate(
+            visible_at=F('pub_date'), entry_id=F('id')
+        )
+    # В лентах выводится только анонс, полный текст не нужен.
+    return posts.defer('text').order_by(*CURSOR_ORDERING)
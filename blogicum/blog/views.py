@@ -1,20 +1,53 @@
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from blog.caching import cache_anonymous_feed, conditional_page
+from blog.constants import COMMENTS_ON_PAGE, COMMENTS_ORDERING
+from blog.export import (
+    export_lines,
+    export_until,
+    format_watermark,
+    parse_watermark,
+)
 from blog.forms import CommentForm, PostForm, ProfileForm
 from blog.models import Category, Comment, Post
-from blog.utils import get_posts, posts_pagination
+from blog.search import (
+    SEARCH_ORDERING,
+    build_match_query,
+    highlight,
+    search_posts,
+)
+from blog.utils import (
+    CursorPage,
+    cursor_pagination,
+    get_posts,
+    posts_pagination,
+    visible_posts,
+)
+from blogicum.routers import read_from_replica
 
 
+@read_from_replica
+@conditional_page
+@cache_anonymous_feed('index')
 def index(request):
     return render(
         request,
         'blog/index.html',
-        {'page_obj': posts_pagination(request, get_posts())},
+        {
+            'page_obj': posts_pagination(
+                request, get_posts(), count_key='index'
+            ),
+        },
     )
 
 
+@read_from_replica
+@conditional_page
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
@@ -28,30 +61,68 @@ def category_posts(request, category_slug):
             'category': category,
             'page_obj': posts_pagination(
                 request,
-                get_posts(category.posts.all()),
+                get_posts(category=category),
+                count_key=f'category:{category.pk}',
             ),
         },
     )
 
 
-def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    if request.user != post.author:
-        post = get_object_or_404(
-            get_posts(
-                Post.objects.all(),
-                with_comments_count=False,
-                use_select_related=False,
-            ),
-            pk=post_id,
+@read_from_replica
+def search(request):
+    query = request.GET.get('q', '').strip()
+    if not build_match_query(query):
+        # Без слов искать нечего: в выборке не было бы поля rank.
+        page_obj = CursorPage([])
+    else:
+        page_obj = cursor_pagination(
+            search_posts(get_posts(), query),
+            request.GET.get('cursor'),
+            ordering=SEARCH_ORDERING,
         )
+    for post in page_obj:
+        post.snippet_html = highlight(post.snippet)
+    return render(
+        request,
+        'blog/search.html',
+        {'query': query, 'page_obj': page_obj},
+    )
+
+
+@read_from_replica
+@conditional_page
+def post_detail(request, post_id):
+    post = get_object_or_404(visible_posts(request.user), pk=post_id)
     return render(
         request,
         'blog/detail.html',
         {
             'post': post,
             'form': CommentForm(),
-            'comments': post.comments.all(),
+            'comments': cursor_pagination(
+                post.comments.select_related('author'),
+                per_page=COMMENTS_ON_PAGE,
+                ordering=COMMENTS_ORDERING,
+            ),
+        },
+    )
+
+
+@read_from_replica
+def post_comments(request, post_id):
+    post = get_object_or_404(visible_posts(request.user), pk=post_id)
+    return render(
+        request,
+        'includes/comments.html',
+        {
+            'post': post,
+            'comments_only': True,
+            'comments': cursor_pagination(
+                post.comments.select_related('author'),
+                request.GET.get('cursor'),
+                per_page=COMMENTS_ON_PAGE,
+                ordering=COMMENTS_ORDERING,
+            ),
         },
     )
 
@@ -98,11 +169,14 @@ def delete_post(request, post_id):
     )
 
 
+@read_from_replica
+@conditional_page
 def profile(request, username):
     author = get_object_or_404(
         get_user_model(),
         username=username,
     )
+    is_public = request.user != author
     return render(
         request,
         'blog/profile.html',
@@ -110,10 +184,8 @@ def profile(request, username):
             'profile': author,
             'page_obj': posts_pagination(
                 request,
-                get_posts(
-                    author.posts.all(),
-                    apply_filters=(request.user != author),
-                ),
+                get_posts(author=author, apply_filters=is_public),
+                count_key=f'profile:{author.pk}:{is_public}',
             ),
         },
     )
@@ -135,7 +207,8 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.post = get_object_or_404(Post, id=post_id)
         comment.author = request.user
-        comment.save()
+        with transaction.atomic():
+            comment.save()
     return redirect('blog:post_detail', post_id)
 
 
@@ -161,6 +234,23 @@ def delete_comment(request, post_id, comment_id):
     if request.user != comment.author:
         return redirect('blog:post_detail', post_id)
     if request.method == 'POST':
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         return redirect('blog:post_detail', post_id)
     return render(request, 'blog/comment.html', {'comment': comment})
+
+
+@staff_member_required
+def export(request):
+    try:
+        since = parse_watermark(request.GET.get('since'))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    until = export_until(since)
+    response = StreamingHttpResponse(
+        export_lines(since, until), content_type='application/x-ndjson'
+    )
+    response['Content-Disposition'] = 'attachment; filename="blogicum.jsonl"'
+    # Отметка since для следующей выгрузки.
+    response['X-Export-Watermark'] = format_watermark(until)
+    return response
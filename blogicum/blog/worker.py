@@ -0,0 +1,21 @@
+"""Точки входа для процессов runworker.
+
+Модуль импортируется в дочернем процессе до django.setup(), поэтому
+модели здесь подключаются только внутри функций.
+"""
+import django
+
+
+def init_worker():
+    django.setup()
+
+
+def run_job_in_worker(job_id):
+    from django.db import connections
+
+    from blog.jobs import run_job
+
+    try:
+        return run_job(job_id)
+    finally:
+        connections.close_all()
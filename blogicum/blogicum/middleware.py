@@ -0,0 +1,183 @@
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+
+from blogicum.routers import get_replicas, mark_write
+
+logger = logging.getLogger('blogicum.timing')
+
+_current_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.sql_time += duration
+            self.queries.append((context['connection'].alias, sql, duration))
+
+
+@contextmanager
+def timed_template_render():
+    """Засчитать рендеринг шаблона в тайминги текущего запроса.
+
+    Вложенные рендеринги уже учтены во внешнем и не суммируются.
+    """
+    timings = _current_timings.get()
+    if timings is None or timings.template_depth:
+        yield
+        return
+    timings.template_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.template_time += time.perf_counter() - start
+        timings.template_depth -= 1
+
+
+class RequestTimingMiddleware:
+    """Замеряет SQL, рендеринг шаблонов и время обработки запроса.
+
+    Итоги уходят в лог ``blogicum.timing``, а при ``SERVER_TIMING`` —
+    и в заголовок Server-Timing; для запросов дольше
+    ``SLOW_REQUEST_THRESHOLD_MS`` в лог пишется и весь выполненный SQL.
+    Время шаблонов считает бэкенд ``TimedDjangoTemplates``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self.wrap_connections(stack, timings)
+                response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self.report(request, response, timings, start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            # Асинхронный ORM выполняет SQL в синхронном потоке запроса,
+            # поэтому обёртки ставятся на соединения этого потока.
+            await sync_to_async(self.wrap_connections)(stack, timings)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current_timings.reset(token)
+        return self.report(request, response, timings, start)
+
+    @staticmethod
+    def wrap_connections(stack, timings):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings))
+
+    @staticmethod
+    def report(request, response, timings, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        sql_ms = timings.sql_time * 1000
+        template_ms = timings.template_time * 1000
+        if getattr(settings, 'SERVER_TIMING', False):
+            response['Server-Timing'] = ', '.join((
+                f'db;dur={sql_ms:.1f};desc="{len(timings.queries)} queries"',
+                f'tpl;dur={template_ms:.1f}',
+                f'view;dur={total_ms:.1f}',
+            ))
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'queries': len(timings.queries),
+            'sql_ms': round(sql_ms, 1),
+            'template_ms': round(template_ms, 1),
+            'total_ms': round(total_ms, 1),
+        }
+        threshold = getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', None)
+        if threshold is not None and total_ms >= threshold:
+            record['sql'] = [
+                {'db': alias, 'ms': round(duration * 1000, 2), 'sql': sql}
+                for alias, sql, duration in timings.queries
+            ]
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
+        return response
+
+
+class ReadYourWritesMiddleware:
+    """Отмечает в сессии успешные изменяющие запросы пользователя.
+
+    После такой отметки read_from_replica какое-то время читает
+    из основной базы, пока реплики не догонят.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.is_write(request, response) and (
+            request.user.is_authenticated
+        ):
+            mark_write(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.is_write(request, response) and (
+            (await request.auser()).is_authenticated
+        ):
+            mark_write(request)
+        return response
+
+    @staticmethod
+    def is_write(request, response):
+        return (
+            get_replicas()
+            and request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+            and response.status_code < 400
+        )
@@ -0,0 +1,130 @@
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from blog.caching import FEED_CHANGED_AT_KEY
+
+# Время последней записи пользователя; пока оно свежее, чтение идёт
+# из основной базы, чтобы автор сразу видел свои изменения.
+LAST_WRITE_SESSION_KEY = '_last_write_at'
+
+_read_database = ContextVar('read_database', default=None)
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def wrote_recently(request):
+    last_write = request.session.get(LAST_WRITE_SESSION_KEY)
+    return (
+        last_write is not None
+        and time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+async def awrote_recently(request):
+    last_write = await request.session.aget(LAST_WRITE_SESSION_KEY)
+    return (
+        last_write is not None
+        and time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+def _within_lag(changed_at):
+    return (
+        changed_at is not None
+        and (timezone.now() - changed_at).total_seconds()
+        < settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+def changed_recently():
+    """Данные блога менялись так недавно, что реплики могут отставать.
+
+    Иначе анонимный запрос прочитал бы с реплики старые данные и положил
+    их в кеш лент уже под новой версией.
+    """
+    return _within_lag(cache.get(FEED_CHANGED_AT_KEY))
+
+
+async def achanged_recently():
+    return _within_lag(await cache.aget(FEED_CHANGED_AT_KEY))
+
+
+def mark_write(request):
+    request.session[LAST_WRITE_SESSION_KEY] = time.time()
+
+
+def read_from_replica(view):
+    """Выполнять чтение внутри представления на одной из реплик.
+
+    Пока реплики могут не догнать недавнюю запись, чтение остаётся
+    в основной базе. Сессия и пользователь загружаются ещё до
+    переключения, из основной базы: иначе только что вошедший
+    пользователь мог бы не найтись на реплике. Асинхронное представление
+    получает request.user уже загруженным, чтобы шаблоны не обращались
+    к базе синхронно.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            request.user = await request.auser()
+            replicas = get_replicas()
+            if not replicas or await achanged_recently() or (
+                request.user.is_authenticated
+                and await awrote_recently(request)
+            ):
+                return await view(request, *args, **kwargs)
+            token = _read_database.set(random.choice(replicas))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_database.reset(token)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        replicas = get_replicas()
+        if not replicas or changed_recently() or (
+            request.user.is_authenticated and wrote_recently(request)
+        ):
+            return view(request, *args, **kwargs)
+        token = _read_database.set(random.choice(replicas))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_database.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Чтение — на реплику, выбранную read_from_replica, запись — в основную.
+
+    Вне read_from_replica чтение тоже идёт в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики — копии основной базы, их схему не трогаем.
+        if db in get_replicas():
+            return False
+        return None
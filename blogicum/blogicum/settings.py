@@ -41,24 +41,51 @@ INSTALLED_APPS = [
 
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
+    'benchmarks.apps.BenchmarksConfig',
 ]
 
 MIDDLEWARE = [
+    'blogicum.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blogicum.middleware.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # 'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Запросы дольше порога пишутся в лог blogicum.timing вместе со всем SQL.
+SLOW_REQUEST_THRESHOLD_MS = 500
+
+# Заголовок Server-Timing раскрывает число запросов и время SQL,
+# поэтому по умолчанию он выводится только при отладке.
+SERVER_TIMING = DEBUG
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'blogicum.template_backends.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -74,13 +101,88 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Под ASGI ленты и страницы публикаций можно отдавать асинхронными
+# представлениями из blog.async_views: BLOGICUM_ASYNC_VIEWS=1.
+ASYNC_VIEWS = os.getenv('BLOGICUM_ASYNC_VIEWS', '') == '1'
+
+# Профиль PRAGMA применяется к каждому новому соединению с SQLite.
+# WAL позволяет читать во время записи, busy_timeout — ждать блокировку,
+# а не сразу падать с «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ, а не в страницах.
+    'cache_size': -20000,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': ';'.join(
+                f'PRAGMA {name} = {value}'
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            # Транзакция сразу берёт блокировку записи: без этого чтение
+            # внутри atomic() и последующая запись приводят к ошибке
+            # блокировки, которую busy_timeout не спасает.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Копии базы только для чтения, например BLOGICUM_DB_REPLICAS=/a.sqlite3,
+# /b.sqlite3. С них читаются ленты и страницы публикаций; запись и
+# страницы, открытые сразу после неё, идут в основную базу.
+DATABASES.update({
+    f'replica_{number}': {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
     }
+    for number, name in enumerate(
+        filter(None, os.getenv('BLOGICUM_DB_REPLICAS', '').split(',')), 1
+    )
+})
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+# Сколько секунд после записи её автор, а после любого изменения
+# данных блога — все читают из основной базы (допустимое отставание реплик).
+READ_YOUR_WRITES_SECONDS = 30
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+    },
+    # Тег {% cache %} берёт этот кеш сам; карточки не вытесняют ключи лент.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-fragments',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
 }
 
+# В кеше 'default' лежат версия лент, их HTML и данные для ETag и
+# Last-Modified. LocMemCache у каждого процесса свой, поэтому под
+# несколькими процессами (gunicorn --workers N) нужен общий кеш, иначе
+# процессы отдают разные ETag и не видят сбросов лент друг друга:
+# BLOGICUM_REDIS_URL=redis://localhost:6379/0 (нужен пакет redis).
+# Ключи карточек содержат их версию, так что фрагменты остаются локальными.
+REDIS_URL = os.getenv('BLOGICUM_REDIS_URL')
+if REDIS_URL:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'blogicum',
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -120,9 +222,23 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {
+        'BACKEND': 'blog.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 handler403 = 'pages.views.permission_denied'
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# 'window' — нумерованные страницы без COUNT(*) на каждый запрос и со
+# ссылками только на соседние страницы, 'page' — классический Paginator,
+# 'cursor' — постраничный вывод по ключу (pub_date, id) без OFFSET.
+POSTS_PAGINATION = 'window'
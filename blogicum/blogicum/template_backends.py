@@ -0,0 +1,25 @@
+from django.template.backends.django import DjangoTemplates, Template
+
+from blogicum.middleware import timed_template_render
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        with timed_template_render():
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates, чьё время рендеринга видит RequestTimingMiddleware.
+
+    Замер стоит только на шаблонах этого бэкенда, а не на всех
+    django.template.Template процесса.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(
+            super().get_template(template_name).template, self
+        )
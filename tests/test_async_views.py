@@ -0,0 +1,89 @@
+import importlib
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve
+
+from blog import async_views
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def _reload_urls():
+    import blog.urls
+    import blogicum.urls
+
+    importlib.reload(blog.urls)
+    importlib.reload(blogicum.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_pages(settings):
+    settings.ASYNC_VIEWS = True
+    _reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    _reload_urls()
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def _get(url, user=None, headers=None):
+    async def get():
+        client = AsyncClient()
+        if user is not None:
+            await client.aforce_login(user)
+        return await client.get(url, headers=headers)
+    return async_to_sync(get)()
+
+
+def test_read_pages_are_async(async_pages, page_urls):
+    views = {resolve(url).func.__name__ for url in page_urls}
+    assert views == {"index", "category_posts", "profile", "post_detail"}
+    for url in page_urls:
+        assert resolve(url).func.__module__ == async_views.__name__, (
+            "Убедитесь, что при ASYNC_VIEWS страницы для чтения отдаются"
+            " асинхронными представлениями."
+        )
+
+
+def test_async_pages_render_like_sync(
+    async_pages, page_urls, user, post_with_published_location
+):
+    post = post_with_published_location
+    for url in page_urls:
+        for reader in (None, user):
+            response = _get(url, reader)
+            assert response.status_code == 200, url
+            assert post.title in response.content.decode("utf-8"), (
+                "Убедитесь, что асинхронная страница выводит публикацию."
+            )
+    assert _get(page_urls[0])["Cache-Control"].startswith("public")
+    etag = _get(page_urls[-1])["ETag"]
+    response = _get(page_urls[-1], headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert _get("/category/missing/").status_code == 404
+
+
+def test_async_detail_hides_unpublished_post(
+    async_pages, user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f"/posts/{post.id}/"
+    assert _get(url, another_user).status_code == 404
+    assert _get(url, user).status_code == 200, (
+        "Убедитесь, что автор видит свою скрытую публикацию."
+    )
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_generate_data_and_run_benchmarks(tmp_path):
+    call_command(
+        "generate_data", users=5, categories=2, locations=3, posts=40,
+        comments=100, batch_size=16, seed=1, stdout=None,
+    )
+    assert Post.objects.count() == 40
+    assert Comment.objects.count() == 100
+    assert sum(Post.objects.values_list("comment_count", flat=True)) == 100
+
+    output = tmp_path / "bench.json"
+    call_command(
+        "run_benchmarks", iterations=3, warmup=1, output=str(output),
+        stdout=None,
+    )
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["dataset"]["posts"] == 40
+    assert set(report["results"]) == {
+        "index_anonymous", "index", "category_posts", "profile",
+        "post_detail", "index_deep_page", "add_comment",
+    }
+    for summary in report["results"].values():
+        assert summary["requests"] == 3
+        assert summary["p50_ms"] <= summary["p99_ms"] <= summary["max_ms"]
@@ -0,0 +1,145 @@
+import gzip
+import io
+import json
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.management.commands import bulk_loaddata
+from blog.models import (
+    Category, Comment, FeedEntry, Location, Post, StoredFile,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def dump_items(mixer, user, published_category, published_location):
+    # В JSON даты сохраняются с точностью до миллисекунд.
+    created_at = (timezone.now() - timedelta(days=400)).replace(microsecond=0)
+    posts = mixer.cycle(5).blend(
+        Post,
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+    )
+    for post in posts:
+        mixer.cycle(2).blend(Comment, post=post, is_published=True)
+    Post.objects.update(created_at=created_at)
+    Category.objects.update(created_at=created_at)
+    out = io.StringIO()
+    call_command(
+        "dumpdata", "blog.category", "blog.location", "blog.post",
+        "blog.comment", stdout=out,
+    )
+    items = json.loads(out.getvalue())
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+    return items, created_at
+
+
+@pytest.mark.parametrize("file_format", ["json", "jsonl", "json.gz"])
+def test_bulk_loaddata_restores_dump(
+    monkeypatch, tmp_path, dump_items, file_format
+):
+    items, created_at = dump_items
+    # Маленькие куски проверяют объекты на границе чтения.
+    monkeypatch.setattr(bulk_loaddata, "READ_CHUNK_SIZE", 50)
+    path = tmp_path / f"dump.{file_format}"
+    opener = gzip.open if file_format.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as file:
+        if file_format == "jsonl":
+            file.writelines(json.dumps(item) + "\n" for item in items)
+        else:
+            json.dump(items, file, indent=2)
+
+    call_command(
+        "bulk_loaddata", str(path), batch_size=2, stdout=io.StringIO()
+    )
+
+    assert Post.objects.count() == 5
+    assert Comment.objects.count() == 10
+    assert not Post.objects.exclude(created_at=created_at).exists(), (
+        "Убедитесь, что при загрузке сохраняются даты создания из дампа."
+    )
+    assert set(Post.objects.values_list("comment_count", flat=True)) == {2}, (
+        "Убедитесь, что после загрузки пересчитывается число комментариев."
+    )
+    post = Post.objects.create(
+        title="Новая", text="Текст", pub_date=timezone.now(),
+        author=Post.objects.first().author,
+    )
+    assert post.pk > max(
+        item["pk"] for item in items if item["model"] == "blog.post"
+    ), "Убедитесь, что после загрузки сбрасываются счётчики первичных ключей."
+
+
+def test_bulk_loaddata_excludes_models(tmp_path, dump_items):
+    items, _ = dump_items
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(items), encoding="utf-8")
+    call_command(
+        "bulk_loaddata", str(path), exclude=["blog.Comment"],
+        stdout=io.StringIO(),
+    )
+    assert Post.objects.count() == 5
+    assert not Comment.objects.exists()
+    assert set(Post.objects.values_list("comment_count", flat=True)) == {0}
+
+
+def test_bulk_loaddata_rejects_truncated_dump(tmp_path, dump_items):
+    items, _ = dump_items
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(items)[:-40], encoding="utf-8")
+    with pytest.raises(bulk_loaddata.CommandError):
+        call_command("bulk_loaddata", str(path), stdout=io.StringIO())
+
+
+def test_bulk_loaddata_loads_repo_fixture():
+    fixture = Path(__file__).resolve().parent.parent / "db.json"
+    call_command("bulk_loaddata", str(fixture), stdout=io.StringIO())
+    assert Post.objects.count() == 39, (
+        "Убедитесь, что db.json загружается в базу после migrate"
+        " без --ignore-conflicts."
+    )
+    assert FeedEntry.objects.exists()
+
+
+def test_bulk_loaddata_updates_existing_rows(tmp_path, dump_items):
+    items, _ = dump_items
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(items), encoding="utf-8")
+    call_command("bulk_loaddata", str(path), stdout=io.StringIO())
+    post = next(item for item in items if item["model"] == "blog.post")
+    post["fields"]["title"] = "Исправленный заголовок"
+    path.write_text(json.dumps(items), encoding="utf-8")
+    call_command("bulk_loaddata", str(path), stdout=io.StringIO())
+    assert Post.objects.get(pk=post["pk"]).title == post["fields"]["title"], (
+        "Убедитесь, что повторная загрузка обновляет объекты с тем же pk."
+    )
+    assert Post.objects.count() == 5
+
+
+def test_bulk_loaddata_retains_images(tmp_path, dump_items):
+    items, _ = dump_items
+    post = next(item for item in items if item["model"] == "blog.post")
+    post["fields"]["image"] = "posts_images/photo.jpg"
+    post["fields"]["image_variants"] = [
+        {"width": 320, "name": "posts_images/photo_320.jpg"},
+    ]
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(items), encoding="utf-8")
+    call_command("bulk_loaddata", str(path), stdout=io.StringIO())
+    refs = dict(StoredFile.objects.filter(
+        name__startswith="posts_images/photo"
+    ).values_list("name", "refs"))
+    assert refs == {
+        "posts_images/photo.jpg": 1,
+        "posts_images/photo_320.jpg": 1,
+    }, "Убедитесь, что для файлов из дампа заводятся счётчики ссылок."
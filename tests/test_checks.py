@@ -0,0 +1,34 @@
+from django.core import checks
+
+
+def _cache_warnings():
+    return [
+        message.id
+        for message in checks.run_checks(
+            tags=[checks.Tags.caches], include_deployment_checks=True
+        )
+    ]
+
+
+def test_process_local_cache_is_reported(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+    assert "blog.W001" in _cache_warnings(), (
+        "Убедитесь, что check --deploy предупреждает о кеше,"
+        " который не виден другим процессам."
+    )
+
+
+def test_shared_cache_passes(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+        },
+    }
+    assert "blog.W001" not in _cache_warnings()
@@ -0,0 +1,89 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _comment_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(pk=post.pk)
+
+
+def test_comment_count_follows_views(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for text in ("first", "second"):
+        user_client.post(f"/posts/{post.id}/comment/", data={"text": text})
+    assert _comment_count(post) == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается"
+        " счётчик комментариев публикации."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _comment_count(post) == 1, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " счётчик комментариев публикации."
+    )
+
+
+def test_comment_count_follows_admin_edits(
+    mixer, post_with_published_location, post_of_another_author
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post, is_published=True)
+    assert _comment_count(post) == 3
+
+    comments[0].is_published = False
+    comments[0].save()
+    assert _comment_count(post) == 2
+
+    comments[1].post = post_of_another_author
+    comments[1].save()
+    assert _comment_count(post) == 1
+    assert _comment_count(post_of_another_author) == 1
+
+    Comment.objects.filter(pk=comments[2].pk).delete()
+    assert _comment_count(post) == 0
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post, is_published=True)
+    Post.objects.update(comment_count=100)
+    call_command("recount_comments", stdout=None)
+    assert _comment_count(post) == 2
+
+
+@pytest.mark.parametrize("comments", [5, 50])
+def test_post_delete_query_budget(
+    django_assert_max_num_queries, mixer, post_with_published_location,
+    comments,
+):
+    post = post_with_published_location
+    mixer.cycle(comments).blend(Comment, post=post, is_published=True)
+    with django_assert_max_num_queries(8):
+        post.delete()
+    assert not Comment.objects.exists()
+
+
+def test_user_delete_recounts_other_posts(
+    mixer, user, another_user, post_with_published_location,
+    post_of_another_author,
+):
+    mixer.cycle(2).blend(
+        Comment, post=post_of_another_author, author=user, is_published=True
+    )
+    mixer.blend(
+        Comment, post=post_of_another_author, author=another_user,
+        is_published=True,
+    )
+    mixer.blend(Comment, post=post_with_published_location, author=user)
+    user.delete()
+    assert not Post.objects.filter(pk=post_with_published_location.pk).exists()
+    assert _comment_count(post_of_another_author) == 1, (
+        "Убедитесь, что при удалении пользователя пересчитываются"
+        " счётчики комментариев к чужим публикациям."
+    )
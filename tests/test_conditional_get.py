@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }
+
+
+@pytest.mark.parametrize("page", ["index", "category", "profile", "detail"])
+def test_unchanged_page_answers_304(
+    client, django_assert_num_queries, page_urls, page
+):
+    url = page_urls[page]
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "public" in response["Cache-Control"]
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что неизменившаяся страница отдаётся ответом 304"
+        " без повторного рендеринга."
+    )
+    assert not response.content
+    assert response["ETag"] == etag
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+
+def test_changes_refresh_validators(
+    client, mixer, page_urls, post_with_published_location
+):
+    etag = client.get(page_urls["detail"])["ETag"]
+    mixer.blend(Comment, post=post_with_published_location)
+    response = client.get(page_urls["detail"], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после нового комментария страница отдаётся заново."
+    )
+
+    author = post_with_published_location.author
+    etag = client.get(page_urls["profile"])["ETag"]
+    author.first_name = "Новое имя"
+    author.save()
+    response = client.get(page_urls["profile"], HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+def test_scheduled_post_refreshes_validators(
+    client, monkeypatch, mixer, post_with_published_location
+):
+    now = timezone.now()
+    scheduled = mixer.blend(
+        Post,
+        is_published=True,
+        category=post_with_published_location.category,
+        pub_date=now + timedelta(hours=1),
+    )
+    response = client.get("/")
+    assert scheduled.title not in response.content.decode("utf-8")
+
+    monkeypatch.setattr(timezone, "now", lambda: now + timedelta(hours=2))
+    response = client.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что страница обновляется, когда наступает дата"
+        " отложенной публикации."
+    )
+
+
+def test_logged_in_pages_are_private(user_client, page_urls):
+    response = user_client.get(page_urls["index"])
+    assert response.status_code == 200
+    assert "ETag" not in response
+    assert "private" in response["Cache-Control"]
@@ -0,0 +1,53 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{i}" for i in range(50))
+
+
+def test_excerpt_is_computed_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == " ".join(LONG_TEXT.split()[:10]) + " …", (
+        "Убедитесь, что анонс публикации вычисляется при сохранении."
+    )
+
+    post.text = "Короткий текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "Короткий текст", (
+        "Убедитесь, что анонс обновляется и при сохранении только текста."
+    )
+
+
+def test_feed_does_not_load_full_text(client, post_with_published_location):
+    post = post_with_published_location
+    post.text = LONG_TEXT
+    post.save()
+    with CaptureQueriesContext(connection) as queries:
+        content = client.get("/").content.decode("utf-8")
+    assert post.excerpt in content
+    assert LONG_TEXT not in content
+    assert not any(
+        '"blog_post"."text"' in query["sql"] for query in queries
+    ), "Убедитесь, что лента не загружает полные тексты публикаций."
+
+    content = client.get(f"/posts/{post.id}/").content.decode("utf-8")
+    assert LONG_TEXT in content
+
+
+def test_fill_excerpts_command(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(text=LONG_TEXT, excerpt="")
+    call_command("fill_excerpts", batch_size=1)
+    post.refresh_from_db()
+    assert post.excerpt.startswith("слово0 слово1"), (
+        "Убедитесь, что команда fill_excerpts заполняет пустые анонсы."
+    )
@@ -0,0 +1,137 @@
+import io
+import json
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def exported_posts(mixer, user, published_category, published_location):
+    posts = mixer.cycle(3).blend(
+        Post,
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+    )
+    for post in posts:
+        mixer.cycle(2).blend(Comment, post=post, is_published=True)
+    # Свежие записи ждут следующей выгрузки (EXPORT_SAFETY_MARGIN).
+    created_at = timezone.now() - timedelta(hours=1)
+    Post.objects.update(created_at=created_at)
+    Comment.objects.update(created_at=created_at)
+    return posts
+
+
+def _read_lines(content):
+    return [json.loads(line) for line in content.splitlines() if line]
+
+
+def test_export_streams_posts_and_comments(admin_client, exported_posts):
+    response = admin_client.get("/export/")
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка отдаётся потоком, а не целиком."
+    )
+    records = _read_lines(b"".join(response.streaming_content).decode())
+    posts = [record for record in records if record["type"] == "post"]
+    comments = [record for record in records if record["type"] == "comment"]
+    assert [post["id"] for post in posts] == [
+        post.id for post in exported_posts
+    ]
+    assert len(comments) == 6
+    post = exported_posts[0]
+    assert posts[0]["author"] == post.author.username
+    assert posts[0]["category"] == post.category.slug
+    assert posts[0]["location"] == post.location.name
+    assert posts[0]["comment_count"] == 2
+
+
+def test_export_since_watermark(admin_client, exported_posts):
+    old = timezone.now() - timedelta(days=30)
+    Post.objects.exclude(pk=exported_posts[-1].pk).update(created_at=old)
+    Comment.objects.update(created_at=old)
+    watermark = (old + timedelta(seconds=1)).isoformat()
+    response = admin_client.get("/export/", {"since": watermark})
+    records = _read_lines(b"".join(response.streaming_content).decode())
+    assert [record["id"] for record in records] == [exported_posts[-1].id], (
+        "Убедитесь, что инкрементальная выгрузка содержит только записи,"
+        " созданные после отметки."
+    )
+    response = admin_client.get("/export/", {"since": "вчера"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("suffix", ["+00:00", "Z"])
+def test_export_since_with_offset(admin_client, exported_posts, suffix):
+    old = timezone.now() - timedelta(days=30)
+    Post.objects.exclude(pk=exported_posts[-1].pk).update(created_at=old)
+    Comment.objects.update(created_at=old)
+    watermark = (old + timedelta(seconds=1)).astimezone(dt_timezone.utc)
+    # Отметка вставлена в URL как есть: «+» дойдёт до сервера пробелом.
+    since = watermark.isoformat().replace("+00:00", suffix)
+    response = admin_client.get(f"/export/?since={since}")
+    assert response.status_code == 200, (
+        "Убедитесь, что выгрузка принимает отметку со смещением,"
+        " переданную без кодирования."
+    )
+    records = _read_lines(b"".join(response.streaming_content).decode())
+    assert [record["id"] for record in records] == [exported_posts[-1].id]
+    assert records[0]["created_at"].endswith("Z"), (
+        "Убедитесь, что даты в выгрузке записываются в UTC с «Z»."
+    )
+
+
+def test_export_is_staff_only(user_client, client):
+    for unauthorized in (user_client, client):
+        response = unauthorized.get("/export/")
+        assert response.status_code == 302, (
+            "Убедитесь, что выгрузка доступна только персоналу."
+        )
+
+
+def test_export_command_reports_watermark(exported_posts):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command("export_jsonl", stdout=stdout, stderr=stderr)
+    records = _read_lines(stdout.getvalue())
+    assert len(records) == 9
+    watermark = stderr.getvalue().split()[-1]
+    assert watermark > max(record["created_at"] for record in records)
+
+    stdout = io.StringIO()
+    call_command(
+        "export_jsonl", since=watermark, stdout=stdout, stderr=io.StringIO()
+    )
+    assert stdout.getvalue() == ""
+
+
+def test_export_keeps_records_created_during_it(
+    monkeypatch, admin_client, mixer, exported_posts
+):
+    monkeypatch.setattr("blog.export.EXPORT_SAFETY_MARGIN", 0)
+    response = admin_client.get("/export/")
+    watermark = response["X-Export-Watermark"]
+    lines = iter(response.streaming_content)
+    first = [next(lines)]
+    post = mixer.blend(
+        Post, author=exported_posts[0].author, is_published=True
+    )
+    comment = mixer.blend(Comment, post=exported_posts[0])
+    records = _read_lines(b"".join([*first, *lines]).decode())
+    assert len(records) == 9
+
+    response = admin_client.get("/export/", {"since": watermark})
+    records = _read_lines(b"".join(response.streaming_content).decode())
+    assert [(record["type"], record["id"]) for record in records] == [
+        ("post", post.id), ("comment", comment.id)
+    ], (
+        "Убедитесь, что записи, созданные во время выгрузки, попадают"
+        " в следующую выгрузку."
+    )
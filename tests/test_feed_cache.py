@@ -0,0 +1,86 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_index_is_served_from_cache(
+    client, django_assert_num_queries, many_posts_with_published_locations
+):
+    first = client.get("/")
+    assert first.status_code == 200
+    with django_assert_num_queries(0):
+        second = client.get("/")
+    assert second.content == first.content, (
+        "Убедитесь, что повторный запрос главной страницы анонимом"
+        " обслуживается из кеша."
+    )
+    client.get("/", {"page": 2})
+    with django_assert_num_queries(0):
+        client.get("/", {"page": 2})
+
+
+def test_index_cache_is_invalidated_on_writes(
+    client, mixer, user, published_category, published_location,
+    many_posts_with_published_locations
+):
+    client.get("/")
+    post = mixer.blend(
+        Post, author=user, category=published_category,
+        location=published_location, title="Совсем свежая публикация",
+        is_published=True, pub_date=timezone.now() - timedelta(seconds=1),
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert post.title in content, (
+        "Убедитесь, что кеш ленты сбрасывается при создании публикации."
+    )
+
+    mixer.blend(Comment, post=post, is_published=True)
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8")
+
+    published_category.is_published = False
+    published_category.save()
+    content = client.get("/").content.decode("utf-8")
+    assert post.title not in content, (
+        "Убедитесь, что кеш ленты сбрасывается при снятии категории"
+        " с публикации."
+    )
+
+
+def test_logged_in_users_bypass_feed_cache(
+    user_client, post_with_published_location
+):
+    user_client.get("/")
+    response = user_client.get("/")
+    assert response.context is not None
+
+
+def test_feed_cache_expires_at_next_scheduled_post(
+    client, mixer, user, published_category,
+    many_posts_with_published_locations
+):
+    from blog.caching import feed_cache_timeout, next_visibility_change
+
+    scheduled = mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        title="Отложенная публикация",
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    mixer.blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert next_visibility_change() == scheduled.pub_date
+    assert 0 <= feed_cache_timeout(next_visibility_change()) <= 1
+
+    assert scheduled.title not in client.get("/").content.decode("utf-8")
+    time.sleep(1.1)
+    assert scheduled.title in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что кеш ленты истекает в момент публикации"
+        " отложенного поста."
+    )
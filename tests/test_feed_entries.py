@@ -0,0 +1,92 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _entry(post):
+    return FeedEntry.objects.filter(pk=post.pk).values(
+        "category_id", "author_id", "visible_at"
+    ).first()
+
+
+def test_entry_follows_post_writes(
+    mixer, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    assert _entry(post) == {
+        "category_id": post.category_id,
+        "author_id": post.author_id,
+        "visible_at": post.pub_date,
+    }, "Убедитесь, что у опубликованного поста есть запись ленты."
+
+    post.category = another_category
+    post.save()
+    assert _entry(post)["category_id"] == another_category.pk
+
+    post.is_published = False
+    post.save()
+    assert _entry(post) is None, (
+        "Убедитесь, что снятый с публикации пост пропадает из лент."
+    )
+    post.is_published = True
+    post.save()
+    post.delete()
+    assert not FeedEntry.objects.exists()
+
+
+def test_entries_follow_category_toggle(
+    client, post_with_published_location
+):
+    post = post_with_published_location
+    category = post.category
+    category.is_published = False
+    category.save()
+    assert _entry(post) is None
+    assert post.title not in client.get("/").content.decode("utf-8")
+
+    category.is_published = True
+    category.save()
+    assert _entry(post) is not None, (
+        "Убедитесь, что записи лент возвращаются вместе с категорией."
+    )
+    assert post.title in client.get("/").content.decode("utf-8")
+
+
+def test_rebuild_feed_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        Post, is_published=False, category=post.category
+    )
+    FeedEntry.objects.all().delete()
+    FeedEntry.objects.create(
+        post=hidden,
+        category=post.category,
+        author=hidden.author,
+        visible_at=hidden.pub_date,
+    )
+    call_command("rebuild_feed", stdout=None)
+    assert list(FeedEntry.objects.values_list("pk", flat=True)) == [
+        post.pk
+    ], "Убедитесь, что rebuild_feed пересобирает записи лент с нуля."
+
+
+def test_rebuild_feed_repairs_updates_bypassing_signals(
+    mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post, is_published=True)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    hidden = mixer.blend(Post, is_published=True, category=post.category)
+    Post.objects.filter(pk=hidden.pk).update(is_published=False)
+    assert FeedEntry.objects.filter(pk=hidden.pk).exists()
+
+    call_command("rebuild_feed", stdout=None)
+    assert not FeedEntry.objects.filter(pk=hidden.pk).exists(), (
+        "Убедитесь, что rebuild_feed убирает из лент посты, снятые с"
+        " публикации в обход сигналов."
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1
@@ -0,0 +1,57 @@
+import pytest
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _card_key(post):
+    return make_template_fragment_key(
+        "post_card", [post.id, post.card_version]
+    )
+
+
+def test_post_cards_are_cached_and_shared(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    fragments = caches["template_fragments"]
+    user_client.get("/")
+    card = fragments.get(_card_key(post))
+    assert card and post.title in card, (
+        "Убедитесь, что карточка публикации кешируется как фрагмент."
+    )
+    fragments.set(_card_key(post), "<p>из кеша</p>")
+    for url in (
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        assert "<p>из кеша</p>" in user_client.get(url).content.decode(), (
+            "Убедитесь, что одна и та же карточка используется на всех"
+            " страницах лент."
+        )
+
+
+@pytest.mark.parametrize("change", [
+    {"title": "Новый заголовок"},
+    {"comment_count": 42},
+])
+def test_card_version_follows_content(
+    user_client, post_with_published_location, change
+):
+    post = post_with_published_location
+    user_client.get("/")
+    Post.objects.filter(pk=post.pk).update(**change)
+    content = user_client.get("/").content.decode("utf-8")
+    assert str(next(iter(change.values()))) in content, (
+        "Убедитесь, что карточка перерисовывается после изменения публикации."
+    )
+
+
+def test_card_version_tracks_category(post_with_published_location):
+    post = post_with_published_location
+    version = post.card_version
+    post.category.title = "Другая категория"
+    assert post.card_version != version
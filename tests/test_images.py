@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.caching import get_feed_version
+from blog.constants import JOB_LEASE_TIMEOUT, JOB_MAX_ATTEMPTS
+from blog.jobs import claim_jobs, requeue_stale_jobs
+from blog.models import Job, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def run_worker():
+    call_command("runworker", "--once", "--processes=0", stdout=None)
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_location, published_category):
+    img = Image.new("RGB", (800, 400), color=(73, 109, 137))
+    exif = Image.Exif()
+    exif[0x010F] = "Secret Camera"
+    img_io = BytesIO()
+    img.save(img_io, "JPEG", exif=exif)
+    return mixer.blend(
+        "blog.Post",
+        is_published=True,
+        location=published_location,
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name="large_image.jpg"),
+    )
+
+
+def test_upload_is_processed_by_worker(post_with_large_image):
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    assert post.image_variants == [], (
+        "Убедитесь, что изображение обрабатывается вне запроса."
+    )
+    assert Job.objects.filter(
+        kind="process_post_image", status=Job.Status.PENDING
+    ).count() == 1
+
+    run_worker()
+
+    post.refresh_from_db()
+    assert Job.objects.get().status == Job.Status.DONE
+    with post.image.open("rb") as file, Image.open(file) as img:
+        assert not img.getexif(), "Убедитесь, что из оригинала удалён EXIF."
+    assert [v["width"] for v in post.image_variants] == [320, 640, 800]
+    storage = post.image.storage
+    for variant in post.image_variants:
+        assert variant["name"].endswith(".webp")
+        with storage.open(variant["name"]) as file, Image.open(file) as img:
+            assert img.format == "WEBP"
+            assert img.width == variant["width"]
+
+
+def test_srcset_is_rendered(user_client, post_with_large_image):
+    run_worker()
+    post = Post.objects.get(pk=post_with_large_image.pk)
+    for url in ("/", f"/posts/{post.pk}/"):
+        content = user_client.get(url).content.decode("utf-8")
+        assert f'srcset="{post.image_srcset}"' in content, (
+            "Убедитесь, что для изображения публикации выводится srcset."
+        )
+
+
+def test_make_thumbnails_backfills(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(image_variants=[])
+    version = get_feed_version()
+    call_command("make_thumbnails", stdout=None)
+    post.refresh_from_db()
+    assert [v["width"] for v in post.image_variants] == [100]
+    assert get_feed_version() != version, (
+        "Убедитесь, что make_thumbnails сбрасывает кеш лент."
+    )
+
+
+def test_failed_jobs_are_retried_then_marked(
+    post_with_published_location, django_capture_on_commit_callbacks
+):
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image.storage.delete(post.image.name)
+    run_worker()
+    job = Job.objects.get()
+    assert job.status == Job.Status.FAILED
+    assert job.attempts == 3
+    assert job.error
+
+
+def test_stale_running_jobs_are_requeued(post_with_large_image):
+    job = Job.objects.get()
+    assert claim_jobs(1) == [job.pk]
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.Status.RUNNING, (
+        "Убедитесь, что задача в работе не перехватывается до конца аренды."
+    )
+    Job.objects.update(
+        updated_at=timezone.now() - timedelta(seconds=JOB_LEASE_TIMEOUT + 1)
+    )
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.Status.DONE, (
+        "Убедитесь, что задачи упавшего воркера возвращаются в очередь."
+    )
+    assert job.attempts == 2
+
+
+def test_stale_job_without_attempts_left_fails(post_with_large_image):
+    Job.objects.update(
+        status=Job.Status.RUNNING,
+        attempts=JOB_MAX_ATTEMPTS,
+        updated_at=timezone.now() - timedelta(seconds=JOB_LEASE_TIMEOUT + 1),
+    )
+    assert requeue_stale_jobs() == 1
+    job = Job.objects.get()
+    assert job.status == Job.Status.FAILED
+    assert job.error
@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+from blog.utils import CURSOR_ORDERING, get_posts
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="План запроса проверяется для SQLite.",
+    ),
+]
+
+
+@pytest.fixture
+def indexed_posts(mixer, user, published_category):
+    return mixer.cycle(30).blend(
+        Post, author=user, category=published_category
+    )
+
+
+@pytest.mark.parametrize(
+    "feed, index_name",
+    [
+        ("index", "feed_visible_at_idx"),
+        ("category", "feed_category_visible_at_idx"),
+        ("profile", "feed_author_visible_at_idx"),
+        ("own_profile", "post_author_pub_date_idx"),
+    ],
+)
+def test_feed_uses_index(
+    indexed_posts, published_category, user, feed, index_name
+):
+    queryset = {
+        "index": lambda: get_posts(),
+        "category": lambda: get_posts(category=published_category),
+        "profile": lambda: get_posts(author=user),
+        "own_profile": lambda: get_posts(author=user, apply_filters=False),
+    }[feed]()
+    plan = queryset.order_by(*CURSOR_ORDERING)[:10].explain()
+    assert f"INDEX {index_name}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_post_comments_use_index(indexed_posts):
+    plan = Comment.objects.filter(post=indexed_posts[0]).explain()
+    assert "USING INDEX comment_post_created_at_idx" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import FeedEntry, Post, make_excerpt
+
+pytestmark = [pytest.mark.django_db]
+
+FIXTURE = Path(__file__).resolve().parent.parent / "db.json"
+
+
+@pytest.fixture
+def loaded_fixture():
+    call_command("loaddata", str(FIXTURE), verbosity=0)
+
+
+def test_loaddata_refreshes_visibility(loaded_fixture):
+    visible = Post.objects.filter(
+        is_published=True, category__is_published=True
+    )
+    assert visible.exists()
+    assert not visible.filter(is_visible=False).exists(), (
+        "Убедитесь, что после loaddata у опубликованных постов"
+        " пересчитан флаг is_visible."
+    )
+    assert not Post.objects.exclude(pk__in=visible).filter(
+        is_visible=True
+    ).exists()
+
+
+def test_loaddata_fills_feeds(client, loaded_fixture):
+    visible = Post.objects.filter(is_visible=True)
+    assert FeedEntry.objects.count() == visible.count() > 0, (
+        "Убедитесь, что после loaddata записи лент пересобраны."
+    )
+    post = visible.filter(pub_date__lt=timezone.now()).latest("pub_date")
+    content = client.get("/").content.decode("utf-8")
+    assert post.title in content, (
+        "Убедитесь, что после loaddata главная страница выводит публикации."
+    )
+
+
+def test_loaddata_fills_excerpts(loaded_fixture):
+    posts = Post.objects.all()
+    assert posts.exists()
+    for post in posts:
+        assert post.excerpt == make_excerpt(post.text), (
+            "Убедитесь, что после loaddata у постов заполнены анонсы."
+        )
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Триггеры поискового индекса есть только в SQLite.",
+    ),
+]
+
+SEARCH_TRIGGERS = {
+    "blog_post_fts_insert",
+    "blog_post_fts_update",
+    "blog_post_fts_delete",
+}
+
+
+@pytest.fixture
+def migrate():
+    leaves = MigrationExecutor(connection).loader.graph.leaf_nodes("blog")
+
+    def migrate_to(name):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("blog", name)])
+
+    yield migrate_to
+    MigrationExecutor(connection).migrate(leaves)
+
+
+def _triggers():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        return {name for name, in cursor.fetchall()}
+
+
+@pytest.mark.parametrize("target, migration", [
+    ("0009_export_indexes", "0010_post_excerpt"),
+    ("0011_feed_entry", "0012_post_is_visible"),
+    ("0012_post_is_visible", "0013_post_search_index_content"),
+    ("0014_drop_post_image_index", "0015_remove_feedentry_comment_count"),
+])
+def test_migration_is_reversible(migrate, target, migration):
+    migrate(target)
+    assert SEARCH_TRIGGERS <= _triggers(), (
+        f"Убедитесь, что откат {migration} сохраняет триггеры поиска."
+    )
+    migrate(migration)
+    assert SEARCH_TRIGGERS <= _triggers(), (
+        f"Убедитесь, что {migration} восстанавливает триггеры поиска."
+    )
+
+
+def _image_indexes():
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, "blog_post"
+        )
+    return [
+        name for name, constraint in constraints.items()
+        if constraint["index"] and constraint["columns"] == ["image"]
+    ]
+
+
+def test_stale_image_index_is_dropped(migrate):
+    migrate("0013_post_search_index_content")
+    with connection.cursor() as cursor:
+        # Индекс, созданный прежней версией 0007.
+        cursor.execute(
+            "CREATE INDEX blog_post_image_2d3ad0f4 ON blog_post (image)"
+        )
+    migrate("0014_drop_post_image_index")
+    assert _image_indexes() == [], (
+        "Убедитесь, что индекс по Post.image удалён."
+    )
+    assert SEARCH_TRIGGERS <= _triggers()
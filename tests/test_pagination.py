@@ -0,0 +1,174 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    same_date = now - timedelta(days=1)
+    pub_dates = (
+        same_date if i % 3 == 0 else now - timedelta(hours=i + 1)
+        for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+def _cursor_links(content):
+    return re.findall(r'href="\?cursor=([^"]*)"', content)
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_cursor_pagination_walks_feed(
+    client, feed_posts, published_category, user, url_name
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    expected = sorted(
+        feed_posts, key=lambda post: (post.pub_date, post.id), reverse=True
+    )
+
+    seen, pages, cursor = [], [], ""
+    while True:
+        response = client.get(url, {"cursor": cursor})
+        assert response.status_code == 200
+        page_obj = response.context["page_obj"]
+        assert len(page_obj) <= N_PER_PAGE
+        seen.extend(post.id for post in page_obj)
+        pages.append([post.id for post in page_obj])
+        if not page_obj.has_next():
+            break
+        assert page_obj.next_cursor in _cursor_links(
+            response.content.decode("utf-8").replace("%3A", ":")
+        ), "Убедитесь, что в пагинаторе выводится ссылка на следующую страницу."
+        cursor = page_obj.next_cursor
+
+    assert seen == [post.id for post in expected], (
+        "Убедитесь, что курсорная пагинация выводит каждую публикацию ровно"
+        " один раз, в порядке «от новых к старым»."
+    )
+
+    response = client.get(url, {"cursor": page_obj.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == pages[-2]
+
+
+def test_invalid_cursor_falls_back_to_first_page(client, feed_posts):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 200
+    page_obj = response.context["page_obj"]
+    assert len(page_obj) == N_PER_PAGE
+    assert not page_obj.has_previous()
+
+
+def test_comments_are_loaded_in_batches(
+    client, mixer, post_with_published_location
+):
+    from blog.constants import COMMENTS_ON_PAGE
+    from blog.models import Comment
+
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_ON_PAGE * 2 + 5).blend(
+        Comment, post=post, is_published=True
+    )
+    expected = [
+        comment.id
+        for comment in sorted(comments, key=lambda c: (c.created_at, c.id))
+    ]
+
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    seen = [comment.id for comment in page]
+    assert len(seen) == COMMENTS_ON_PAGE, (
+        "Убедитесь, что на странице публикации выводится ограниченное"
+        " число комментариев."
+    )
+    while page.has_next():
+        fragment = client.get(
+            f"/posts/{post.id}/comments/", {"cursor": page.next_cursor}
+        )
+        assert fragment.status_code == 200
+        assert "<form" not in fragment.content.decode("utf-8")
+        page = fragment.context["comments"]
+        seen.extend(comment.id for comment in page)
+    assert seen == expected
+
+
+def test_comment_fragment_respects_post_visibility(
+    client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
+    assert user_client.get(f"/posts/{post.id}/comments/").status_code == 200
+
+
+@pytest.fixture
+def long_feed(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE * 8).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i + 1) for i in range(N_PER_PAGE * 8)),
+    )
+
+
+def test_window_pagination_links_neighbours_only(user_client, long_feed):
+    response = user_client.get("/", {"page": 4})
+    page_obj = response.context["page_obj"]
+    assert [post.id for post in page_obj] == [
+        post.id for post in long_feed[N_PER_PAGE * 3:N_PER_PAGE * 4]
+    ]
+    assert list(page_obj.page_links) == [1, 2, 3, 4, 5, 6, "…", 8], (
+        "Убедитесь, что пагинатор ссылается только на первую, последнюю"
+        " и соседние страницы."
+    )
+    content = response.content.decode("utf-8")
+    assert 'href="?page=8"' in content
+    assert 'href="?page=7"' not in content
+
+    response = user_client.get("/", {"page": 100})
+    assert response.context["page_obj"].number == 8
+
+
+def test_window_pagination_caches_total(
+    django_assert_num_queries, long_feed
+):
+    from blog.utils import get_posts, window_pagination
+
+    window_pagination(get_posts(), 2, count_key="index")
+    with django_assert_num_queries(1):
+        page_obj = window_pagination(get_posts(), 3, count_key="index")
+    assert page_obj.last_page == 8
+    assert page_obj.has_next() and page_obj.has_previous()
+
+
+def test_window_pagination_without_total_is_capped(
+    django_assert_num_queries, long_feed
+):
+    from blog.utils import get_posts, window_pagination
+
+    with django_assert_num_queries(2):
+        page_obj = window_pagination(get_posts(), 1)
+    assert page_obj.last_page is None
+    assert list(page_obj.page_links) == [1, 2, 3, "…"]
+    page_obj = window_pagination(get_posts(), 7)
+    assert page_obj.last_page == 8
+    assert list(page_obj.page_links) == [1, "…", 5, 6, 7, 8]
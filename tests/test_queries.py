@@ -0,0 +1,78 @@
+import pytest
+
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+FEED_QUERY_BUDGET = {
+    # На холодном кеше анониму ещё считаются валидаторы для условного GET:
+    # последняя видимая и ближайшая отложенная публикации.
+    "index": 4,
+    "category": 5,
+    "profile": 5,
+}
+
+
+@pytest.fixture
+def commented_posts(mixer, many_posts_with_published_locations):
+    for post in many_posts_with_published_locations:
+        mixer.cycle(2).blend(Comment, post=post, is_published=True)
+    return many_posts_with_published_locations
+
+
+@pytest.mark.parametrize("url_name", FEED_QUERY_BUDGET)
+def test_feed_query_budget(
+    client,
+    django_assert_max_num_queries,
+    commented_posts,
+    published_category,
+    user,
+    url_name,
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    with django_assert_max_num_queries(FEED_QUERY_BUDGET[url_name]):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert "Комментарии (2)" in response.content.decode("utf-8"), (
+        "Убедитесь, что в карточке публикации выводится число комментариев."
+    )
+
+
+@pytest.mark.parametrize("client_fixture, budget", [
+    # Валидаторы условного GET, публикация и комментарии с авторами.
+    ("client", 4),
+    # Плюс сессия и пользователь.
+    ("user_client", 4),
+    ("another_user_client", 4),
+])
+def test_post_detail_query_budget(
+    request,
+    mixer,
+    django_assert_max_num_queries,
+    post_with_published_location,
+    client_fixture,
+    budget,
+):
+    post = post_with_published_location
+    mixer.cycle(20).blend(Comment, post=post, is_published=True)
+    client = request.getfixturevalue(client_fixture)
+    with django_assert_max_num_queries(budget):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == 20
+
+
+def test_author_sees_own_hidden_post_in_one_query(
+    user_client, django_assert_max_num_queries, post_with_published_location,
+    another_user_client,
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    with django_assert_max_num_queries(4):
+        assert user_client.get(f"/posts/{post.id}/").status_code == 200
+    assert another_user_client.get(f"/posts/{post.id}/").status_code == 404
@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.caching import FEED_CHANGED_AT_KEY, invalidate_feeds
+from blog.models import Post
+from blogicum.routers import LAST_WRITE_SESSION_KEY, ReplicaRouter
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def routed_reads(settings, monkeypatch):
+    # Тестовая «реплика» — та же база: проверяется только выбор псевдонима.
+    settings.DATABASE_REPLICAS = ["default"]
+    reads = []
+    db_for_read = ReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        alias = db_for_read(self, model, **hints)
+        reads.append((model, alias))
+        return alias
+
+    monkeypatch.setattr(ReplicaRouter, "db_for_read", spy)
+    return reads
+
+
+@pytest.fixture
+def replicas_caught_up(settings):
+    # Данные фикстур записаны давно: реплики успели их получить.
+    cache.set(
+        FEED_CHANGED_AT_KEY,
+        timezone.now()
+        - timedelta(seconds=settings.READ_YOUR_WRITES_SECONDS + 1),
+        timeout=None,
+    )
+
+
+def _aliases(reads, model):
+    return {alias for read_model, alias in reads if read_model is model}
+
+
+def test_pages_read_from_replica(
+    routed_reads, client, user_client, post_with_published_location,
+    replicas_caught_up,
+):
+    post = post_with_published_location
+    for reader in (client, user_client):
+        routed_reads.clear()
+        assert reader.get(f"/posts/{post.id}/").status_code == 200
+        assert _aliases(routed_reads, Post) == {"default"}, (
+            "Убедитесь, что страница публикации читается с реплики."
+        )
+    assert _aliases(routed_reads, Session) == {None}
+    assert _aliases(routed_reads, get_user_model()) == {None}, (
+        "Убедитесь, что сессия и пользователь читаются из основной базы."
+    )
+
+
+def test_author_reads_own_writes_from_primary(
+    settings, routed_reads, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Новый комментарий"}
+    )
+    assert response.status_code == 302
+    assert LAST_WRITE_SESSION_KEY in user_client.session
+
+    routed_reads.clear()
+    user_client.get(f"/posts/{post.id}/")
+    assert _aliases(routed_reads, Post) == {None}, (
+        "Убедитесь, что сразу после записи автор читает из основной базы."
+    )
+
+    settings.READ_YOUR_WRITES_SECONDS = 0
+    routed_reads.clear()
+    user_client.get(f"/posts/{post.id}/")
+    assert _aliases(routed_reads, Post) == {"default"}
+
+
+def test_pages_read_from_primary_after_any_write(
+    settings, routed_reads, client, post_with_published_location,
+    replicas_caught_up,
+):
+    invalidate_feeds()
+    routed_reads.clear()
+    assert client.get("/").status_code == 200
+    assert _aliases(routed_reads, Post) == {None}, (
+        "Убедитесь, что пока реплики могут отставать, ленты читаются из"
+        " основной базы и в кеш не попадают устаревшие страницы."
+    )
+
+    settings.READ_YOUR_WRITES_SECONDS = 0
+    routed_reads.clear()
+    client.get(f"/posts/{post_with_published_location.id}/")
+    assert _aliases(routed_reads, Post) == {"default"}
+
+
+def test_router_keeps_writes_and_migrations_on_primary(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    router = ReplicaRouter()
+    assert router.db_for_write(Post) == "default"
+    assert router.allow_migrate("replica_1", "blog") is False
+    assert router.allow_migrate("default", "blog") is None
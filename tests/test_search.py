@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import build_match_query
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    past = timezone.now() - timedelta(days=1)
+
+    def blend(title, text, **kwargs):
+        kwargs.setdefault("is_published", True)
+        kwargs.setdefault("category", published_category)
+        kwargs.setdefault("pub_date", past)
+        return mixer.blend(
+            Post, author=user, title=title, text=text, **kwargs
+        )
+
+    return {
+        "title": blend("Ёжики в тумане", "Прогулка по лесу."),
+        "text": blend("Прогулка", "Вечером в тумане видели ёжика <b>."),
+        "other": blend("Котики", "Ничего общего."),
+        "hidden": blend("Ёжик", "Снят с публикации", is_published=False),
+        "future": blend(
+            "Ёжик", "Из будущего", pub_date=timezone.now() + timedelta(1)
+        ),
+    }
+
+
+def test_match_query_is_quoted_and_stemmed():
+    assert build_match_query('Ёжики OR "туман" NEAR(') == (
+        '"ежик"* "or"* "туман"* "near"*'
+    )
+
+
+def test_search_ranks_and_filters(client, searchable_posts):
+    response = client.get("/search/", {"q": "ёжик"})
+    assert response.status_code == 200
+    found = [post.id for post in response.context["page_obj"]]
+    assert found == [
+        searchable_posts["title"].id, searchable_posts["text"].id
+    ], (
+        "Убедитесь, что поиск находит слово в разных формах, ставит"
+        " совпадения в заголовке выше и скрывает неопубликованные посты."
+    )
+    content = response.content.decode("utf-8")
+    assert "<mark>ёжика</mark>" in content, (
+        "Убедитесь, что сниппет показывает текст публикации без изменений."
+    )
+    assert "&lt;b&gt;" in content, "Убедитесь, что сниппет экранируется."
+
+
+def test_search_index_follows_edits(client, searchable_posts):
+    post = searchable_posts["other"]
+    post.text = "Теперь и здесь есть ёжики."
+    post.save()
+    found = {p.id for p in client.get("/search/", {"q": "ежики"}).context[
+        "page_obj"
+    ]}
+    assert post.id in found
+
+    post.delete()
+    found = {p.id for p in client.get("/search/", {"q": "ежики"}).context[
+        "page_obj"
+    ]}
+    assert post.id not in found
+
+
+def test_search_is_cursor_paginated(client, mixer, user, published_category):
+    mixer.cycle(15).blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1), title="Туман",
+        text=mixer.sequence(lambda i: "туман " * (i + 1)),
+    )
+    first = client.get("/search/", {"q": "туман"}).context["page_obj"]
+    second = client.get(
+        "/search/", {"q": "туман", "cursor": first.next_cursor}
+    ).context["page_obj"]
+    ids = [post.id for post in first] + [post.id for post in second]
+    assert len(first) == 10 and len(ids) == len(set(ids)) == 15
+    ranks = [post.rank for post in first] + [post.rank for post in second]
+    assert ranks == sorted(ranks)
+
+
+def test_admin_search_uses_index(admin_client, searchable_posts):
+    response = admin_client.get("/admin/blog/post/", {"q": "ёжики"})
+    assert response.status_code == 200
+    found = {post.id for post in response.context["cl"].result_list}
+    assert found == {
+        searchable_posts[key].id for key in ("title", "text", "hidden",
+                                             "future")
+    }
+
+
+@pytest.mark.parametrize("query", ["", "!!!"])
+def test_search_without_words(client, user_client, searchable_posts, query):
+    for current_client in (client, user_client):
+        response = current_client.get("/search/", {"q": query})
+        assert response.status_code == 200, (
+            "Убедитесь, что страница поиска открывается без запроса и с"
+            " запросом без слов."
+        )
+        assert list(response.context["page_obj"]) == []
+
+
+def test_foreign_cursor_falls_back_to_first_page(
+    client, mixer, user, published_category
+):
+    mixer.cycle(15).blend(
+        Post, author=user, category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1), title="Туман",
+    )
+    index_cursor = client.get("/", {"cursor": ""}).context[
+        "page_obj"
+    ].next_cursor
+    search = client.get("/search/", {"q": "туман"})
+    search_cursor = search.context["page_obj"].next_cursor
+    assert index_cursor and search_cursor
+
+    response = client.get("/search/", {"q": "туман", "cursor": index_cursor})
+    assert response.status_code == 200, (
+        "Убедитесь, что курсор другой ленты не ломает страницу поиска."
+    )
+    assert [p.id for p in response.context["page_obj"]] == [
+        p.id for p in search.context["page_obj"]
+    ]
+    response = client.get("/", {"cursor": search_cursor})
+    assert response.status_code == 200, (
+        "Убедитесь, что курсор поиска не ломает главную страницу."
+    )
+    assert not response.context["page_obj"].has_previous()
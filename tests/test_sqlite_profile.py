@@ -0,0 +1,40 @@
+import pytest
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Профиль PRAGMA относится только к SQLite.",
+    ),
+]
+
+
+def _pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("synchronous", 1),
+    ("busy_timeout", settings.SQLITE_PRAGMAS["busy_timeout"]),
+    ("cache_size", settings.SQLITE_PRAGMAS["cache_size"]),
+    ("temp_store", 2),
+])
+def test_connection_applies_pragma_profile(name, expected):
+    assert _pragma(name) == expected, (
+        f"Убедитесь, что при подключении к SQLite выставляется PRAGMA {name}."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_transactions_begin_immediate():
+    with CaptureQueriesContext(connection) as captured:
+        with transaction.atomic():
+            pass
+    assert captured[0]["sql"] == "BEGIN IMMEDIATE", (
+        "Убедитесь, что транзакции сразу берут блокировку на запись."
+    )
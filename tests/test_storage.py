@@ -0,0 +1,107 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.db import transaction
+from PIL import Image
+
+from blog.models import Post, StoredFile
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _image_file(name, color=(12, 34, 56)):
+    img_io = BytesIO()
+    Image.new("RGB", (60, 40), color=color).save(img_io, "PNG")
+    return ImageFile(img_io, name=name)
+
+
+@pytest.fixture
+def posts_with_same_image(mixer, user, published_category):
+    return [
+        mixer.blend(
+            Post, author=user, category=published_category,
+            image=_image_file(name),
+        )
+        for name in ("first.PNG", "second.png")
+    ]
+
+
+def test_same_upload_is_stored_once(posts_with_same_image):
+    first, second = posts_with_same_image
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения хранятся в одном файле."
+    )
+    assert first.image.name.startswith("posts_images/")
+    assert first.image.name.endswith(".png")
+    assert StoredFile.objects.get(name=first.image.name).refs == 2
+
+
+def test_file_is_removed_with_last_reference(
+    user_client, posts_with_same_image, django_capture_on_commit_callbacks
+):
+    first, second = posts_with_same_image
+    storage = first.image.storage
+    name = first.image.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{first.id}/delete/")
+    assert storage.exists(name), (
+        "Убедитесь, что при удалении публикации не удаляется изображение,"
+        " которое используется в другой публикации."
+    )
+    assert StoredFile.objects.get(name=name).refs == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{second.id}/delete/")
+    assert not storage.exists(name)
+    assert not StoredFile.objects.filter(name=name).exists()
+
+
+def test_replacing_image_releases_previous_file(
+    posts_with_same_image, django_capture_on_commit_callbacks
+):
+    first, second = posts_with_same_image
+    old_name = first.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        first.image = _image_file("other.png", color=(200, 0, 0))
+        first.save()
+        second.image = _image_file("other.png", color=(200, 0, 0))
+        second.save()
+    assert first.image.name == second.image.name != old_name
+    assert not first.image.storage.exists(old_name)
+
+
+def test_file_survives_rolled_back_delete(
+    posts_with_same_image, django_capture_on_commit_callbacks
+):
+    first, second = posts_with_same_image
+    storage = first.image.storage
+    name = first.image.name
+    storage.delete(name)
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            storage.delete(name)
+            raise RuntimeError
+    assert not callbacks
+    assert storage.exists(name), (
+        "Убедитесь, что файл не удаляется с диска при откате транзакции."
+    )
+    assert StoredFile.objects.get(name=name).refs == 1
+
+
+def test_file_kept_when_reuploaded_before_commit(
+    posts_with_same_image, django_capture_on_commit_callbacks
+):
+    first, second = posts_with_same_image
+    storage = first.image.storage
+    name = first.image.name
+    storage.delete(name)
+    with django_capture_on_commit_callbacks(execute=True):
+        storage.delete(name)
+        storage.save("posts_images/again.png", _image_file("again.png"))
+    assert storage.exists(name), (
+        "Убедитесь, что файл не удаляется, если на него снова сослались"
+        " до фиксации транзакции."
+    )
+    assert StoredFile.objects.get(name=name).refs == 1
@@ -0,0 +1,64 @@
+import json
+import logging
+import re
+
+import pytest
+from django.template import Template
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _timing(response):
+    return dict(
+        (name, float(duration))
+        for name, duration in re.findall(
+            r"(\w+);dur=([\d.]+)", response["Server-Timing"]
+        )
+    )
+
+
+def test_server_timing_header(
+    client, settings, many_posts_with_published_locations
+):
+    settings.SERVER_TIMING = True
+    response = client.get("/")
+    timing = _timing(response)
+    assert set(timing) == {"db", "tpl", "view"}
+    assert 'desc="4 queries"' in response["Server-Timing"]
+    assert timing["view"] >= timing["db"]
+    assert timing["tpl"] > 0
+
+
+def test_server_timing_header_is_off_by_default(
+    client, many_posts_with_published_locations
+):
+    assert "Server-Timing" not in client.get("/"), (
+        "Убедитесь, что Server-Timing выводится только при SERVER_TIMING."
+    )
+
+
+def test_template_class_is_not_patched(client):
+    client.get("/")
+    assert Template.render.__module__ == "django.template.base", (
+        "Убедитесь, что время шаблонов замеряется без подмены"
+        " django.template.Template.render."
+    )
+
+
+def test_slow_requests_log_their_sql(
+    caplog, client, many_posts_with_published_locations
+):
+    logger = logging.getLogger("blogicum.timing")
+    logger.propagate = True
+    try:
+        with override_settings(SLOW_REQUEST_THRESHOLD_MS=0):
+            with caplog.at_level(logging.INFO, "blogicum.timing"):
+                client.get("/")
+    finally:
+        logger.propagate = False
+    record = json.loads(caplog.records[-1].getMessage())
+    assert caplog.records[-1].levelno == logging.WARNING
+    assert record["view"] == "blog:index"
+    assert record["queries"] == len(record["sql"]) == 4
+    assert record["sql"][0]["sql"].startswith("SELECT")
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry, Post
+from blog.utils import published_posts_filter, refresh_visibility
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _is_visible(post):
+    return Post.objects.values_list("is_visible", flat=True).get(pk=post.pk)
+
+
+def test_visibility_follows_post_saves(
+    post_with_published_location, mixer
+):
+    post = post_with_published_location
+    assert _is_visible(post)
+    post.is_published = False
+    post.save(update_fields=["is_published"])
+    assert not _is_visible(post), (
+        "Убедитесь, что снятый с публикации пост не виден в лентах."
+    )
+    post.is_published = True
+    post.category = mixer.blend("blog.Category", is_published=False)
+    post.save()
+    assert not _is_visible(post), (
+        "Убедитесь, что пост из скрытой категории не виден в лентах."
+    )
+
+
+def test_category_toggle_is_one_update(
+    client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    category = post.category
+    hidden = mixer.blend(Post, category=category, is_published=False)
+    category.is_published = False
+    with CaptureQueriesContext(connection) as queries:
+        category.save()
+    post_updates = [
+        query["sql"] for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(post_updates) == 1, (
+        "Убедитесь, что видимость постов категории пересчитывается"
+        " одним UPDATE."
+    )
+    assert not _is_visible(post)
+    assert client.get(f"/posts/{post.id}/").status_code == 404
+
+    category.is_published = True
+    category.save()
+    assert _is_visible(post)
+    assert not _is_visible(hidden), (
+        "Убедитесь, что возврат категории не публикует скрытые посты."
+    )
+
+
+@pytest.mark.parametrize("posts", [1, 30])
+def test_category_republish_is_constant_queries(
+    mixer, published_category, posts
+):
+    mixer.cycle(posts).blend(
+        Post, category=published_category, is_published=True
+    )
+    published_category.is_published = False
+    published_category.save()
+    assert not FeedEntry.objects.exists()
+    published_category.is_published = True
+    with CaptureQueriesContext(connection) as queries:
+        published_category.save()
+    feed_inserts = [
+        query["sql"] for query in queries
+        if query["sql"].startswith('INSERT INTO "blog_feedentry"')
+    ]
+    assert len(feed_inserts) == 1, (
+        "Убедитесь, что записи лент категории восстанавливаются"
+        " одним INSERT … SELECT."
+    )
+    assert len(queries) == 5, (
+        "Убедитесь, что число запросов при публикации категории"
+        " не зависит от числа постов."
+    )
+    assert FeedEntry.objects.filter(
+        category=published_category
+    ).count() == posts
+
+
+def test_deleted_category_hides_posts(post_with_published_location):
+    post = post_with_published_location
+    post.category.delete()
+    assert not _is_visible(post)
+
+
+def test_refresh_visibility(post_with_published_location):
+    post = post_with_published_location
+    Post.objects.update(is_visible=False)
+    refresh_visibility()
+    assert _is_visible(post)
+    assert "blog_category" not in str(
+        Post.objects.filter(published_posts_filter()).query
+    ), "Убедитесь, что проверка видимости не соединяет посты с категориями."